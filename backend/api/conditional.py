@@ -0,0 +1,87 @@
+# backend/api/conditional.py
+#
+# Conditional GET for polled sensor endpoints. Validators come from the
+# per-device data version (bumped only when ingest adds/changes rows), so a
+# matching If-None-Match / If-Modified-Since is answered with 304 before any
+# pandas work happens.
+
+import hashlib
+import uuid
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterable, Optional
+
+from fastapi import Request, Response
+
+from backend.dropbox import service as dropbox_service
+
+# Versions restart with the process; the boot id keeps old ETags from matching.
+_BOOT_ID = uuid.uuid4().hex[:8]
+
+
+def validators(request: Request, devices: Iterable[str]) -> Optional[Dict[str, str]]:
+    """
+    ETag / Last-Modified / Cache-Control headers for a request over the given
+    devices, or None while any device has no data version yet.
+    """
+    versions = []
+    last_modified: Optional[datetime] = None
+    for device in devices:
+        version, modified = dropbox_service.get_data_version(device)
+        if version == 0:
+            return None
+        versions.append(f"{device}.{version}")
+        if last_modified is None or modified > last_modified:
+            last_modified = modified
+
+    # The representation also depends on the query and the negotiated format
+    variant = f"{request.url.query}|{request.headers.get('accept', '')}"
+    digest = hashlib.sha1(variant.encode("utf-8")).hexdigest()[:12]
+
+    return {
+        "ETag": f'W/"{_BOOT_ID}-{"-".join(versions)}-{digest}"',
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # weak comparison: ignore W/ prefixes
+    wanted = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if (tag[2:] if tag.startswith("W/") else tag) == wanted:
+            return True
+    return False
+
+
+def not_modified(request: Request, headers: Optional[Dict[str, str]]) -> Optional[Response]:
+    """
+    304 response if the client's validators still match, else None.
+    """
+    if headers is None:
+        return None
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if _etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        return None
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return None
+        if parsedate_to_datetime(headers["Last-Modified"]) <= since:
+            return Response(status_code=304, headers=headers)
+
+    return None
+
+
+def apply(response: Response, headers: Optional[Dict[str, str]]) -> None:
+    if headers:
+        response.headers.update(headers)
@@ -0,0 +1,192 @@
+# backend/api/encoding.py
+#
+# Response encodings for sensor frames. "records" (list of dicts) stays the
+# default; the others are column-oriented and skip the per-row dict build:
+#
+#   records -> application/json                      [{"timestamp": ..., ...}, ...]
+#   columns -> application/json                      {"timestamp": [...], "COM_1 Wd_0": [...]}
+#   arrow   -> application/vnd.apache.arrow.stream   Arrow IPC stream
+#   msgpack -> application/msgpack                   columns shape, MessagePack
+#
+# Exports (ndjson / csv) are streamed in fixed-size row chunks instead.
+
+import json
+import zlib
+from typing import Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+from fastapi import HTTPException, Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+FORMATS = ("records", "columns", "arrow", "msgpack")
+
+MEDIA_TYPES = {
+    "records": "application/json",
+    "columns": "application/json",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "msgpack": "application/msgpack",
+}
+
+_ACCEPT_FORMATS = {
+    "application/vnd.apache.arrow.stream": "arrow",
+    "application/msgpack": "msgpack",
+    "application/x-msgpack": "msgpack",
+}
+
+
+def negotiate(fmt: Optional[str], accept: Optional[str]) -> str:
+    """
+    Explicit ?format= wins, then the Accept header, then records.
+    """
+    if fmt:
+        return fmt
+    if accept:
+        for part in accept.split(","):
+            media = part.split(";")[0].strip().lower()
+            if media in _ACCEPT_FORMATS:
+                return _ACCEPT_FORMATS[media]
+    return "records"
+
+
+# ─────────────────────────────────────────────────────────────
+# Column extraction
+# ─────────────────────────────────────────────────────────────
+def _timestamp_strings(s: pd.Series) -> List[Optional[str]]:
+    if getattr(s.dt, "tz", None) is not None:
+        return [None if pd.isna(t) else t.isoformat() for t in s]
+    values = np.datetime_as_string(s.values.astype("datetime64[s]"), unit="s").astype(object)
+    values[s.isna().to_numpy()] = None
+    return values.tolist()
+
+
+def _column(s: pd.Series, numpy_ok: bool):
+    """
+    numpy_ok: return numeric columns as NumPy arrays (orjson serialises them
+    natively, NaN -> null); otherwise as lists with None for missing values.
+    """
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return _timestamp_strings(s)
+    if pd.api.types.is_bool_dtype(s) or pd.api.types.is_numeric_dtype(s):
+        values = s.to_numpy()
+        if numpy_ok and values.dtype.kind in "biuf":
+            return values
+        out = values.astype(object)
+        if values.dtype.kind == "f":
+            out[np.isnan(values)] = None
+        return out.tolist()
+    return [None if pd.isna(v) else v for v in s.astype(object)]
+
+
+def frame_to_columns(df: pd.DataFrame, numpy_ok: bool = False) -> Dict[str, object]:
+    return {str(col): _column(df[col], numpy_ok) for col in df.columns}
+
+
+# ─────────────────────────────────────────────────────────────
+# Encoders
+# ─────────────────────────────────────────────────────────────
+def _encode_columns(df: pd.DataFrame) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(frame_to_columns(df, numpy_ok=True), option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(frame_to_columns(df)).encode("utf-8")
+
+
+def require(fmt: str) -> None:
+    """
+    406 up front for a format whose encoder isn't installed.
+    """
+    if fmt == "arrow" and pa is None:
+        raise HTTPException(status_code=406, detail="Arrow encoding requires pyarrow")
+    if fmt == "msgpack" and msgpack is None:
+        raise HTTPException(status_code=406, detail="MessagePack encoding requires msgpack")
+    if fmt not in FORMATS:
+        raise HTTPException(status_code=406, detail=f"Unsupported format: {fmt}")
+
+
+def _encode_arrow(df: pd.DataFrame) -> bytes:
+    require("arrow")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _encode_msgpack(df: pd.DataFrame) -> bytes:
+    require("msgpack")
+    return msgpack.packb(frame_to_columns(df), use_bin_type=True)
+
+
+def encode_body(df: pd.DataFrame, fmt: str) -> bytes:
+    if fmt == "columns":
+        return _encode_columns(df)
+    if fmt == "arrow":
+        return _encode_arrow(df)
+    if fmt == "msgpack":
+        return _encode_msgpack(df)
+    raise HTTPException(status_code=406, detail=f"Unsupported format: {fmt}")
+
+
+def encode_frame(df: pd.DataFrame, fmt: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Encode a frame as a ready Response (bypasses jsonable_encoder).
+    """
+    return Response(content=encode_body(df, fmt), media_type=MEDIA_TYPES[fmt], headers=headers)
+
+
+# ─────────────────────────────────────────────────────────────
+# Streaming exports (NDJSON / CSV in row chunks)
+# ─────────────────────────────────────────────────────────────
+EXPORT_CHUNK_ROWS = 5000
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def iter_export(
+    df: pd.DataFrame,
+    fmt: str,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+    transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+) -> Iterator[bytes]:
+    """
+    Yield the frame as NDJSON or CSV, chunk_rows at a time. Only one chunk is
+    ever serialised in memory; transform is applied per chunk.
+    """
+    for i in range(0, len(df), chunk_rows):
+        chunk = df.iloc[i: i + chunk_rows]
+        if transform is not None:
+            chunk = transform(chunk.copy())
+        if fmt == "csv":
+            text = chunk.to_csv(index=False, header=(i == 0), date_format="%Y-%m-%dT%H:%M:%S")
+        else:
+            text = chunk.to_json(orient="records", lines=True, date_format="iso")
+            if not text.endswith("\n"):
+                text += "\n"
+        yield text.encode("utf-8")
+
+
+def gzip_stream(chunks: Iterator[bytes], level: int = 6) -> Iterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)   # 31 = gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,121 @@
+# backend/api/live.py
+#
+# Live feed of newly ingested sensor rows. A single producer (the ingest
+# listener registered below) encodes each update once per (device, interval)
+# that has subscribers and fans the message out to per-subscriber asyncio
+# queues; the SSE and WebSocket routes only drain their own queue.
+
+import asyncio
+import json
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from backend.dropbox import rollups
+from backend.dropbox import service as dropbox_service
+
+LIVE_DEVICES = ("wise4051", "wise4012")
+LIVE_INTERVALS = ("raw",) + tuple(rollups.ROLLUP_FREQS)
+
+QUEUE_SIZE = 64          # per subscriber; oldest message dropped when full
+MAX_ROWS = 1000          # cap per message (e.g. after a long sync gap)
+HEARTBEAT_SECONDS = 15
+
+# Each subscriber: {"queue", "loop", "devices", "interval"}
+_subscribers: List[Dict] = []
+_lock = threading.Lock()
+
+
+# ─────────────────────────────────────────────────────────────
+# Subscriptions
+# ─────────────────────────────────────────────────────────────
+def subscribe(devices: Iterable[str], interval: str = "raw") -> Dict:
+    """
+    Register a subscriber on the running event loop.
+    Messages arrive on sub["queue"] as (event_id, json_text).
+    """
+    sub = {
+        "queue": asyncio.Queue(maxsize=QUEUE_SIZE),
+        "loop": asyncio.get_running_loop(),
+        "devices": set(devices),
+        "interval": interval,
+    }
+    with _lock:
+        _subscribers.append(sub)
+    return sub
+
+
+def unsubscribe(sub: Dict) -> None:
+    with _lock:
+        if sub in _subscribers:
+            _subscribers.remove(sub)
+
+
+def subscriber_count() -> int:
+    return len(_subscribers)
+
+
+def _offer(queue: asyncio.Queue, message: Tuple[str, str]) -> None:
+    # Runs on the subscriber's loop. A slow consumer loses its oldest
+    # update instead of stalling the producer.
+    if queue.full():
+        try:
+            queue.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+    queue.put_nowait(message)
+
+
+# ─────────────────────────────────────────────────────────────
+# Producer
+# ─────────────────────────────────────────────────────────────
+def _frame_for(device: str, interval: str, new_rows: pd.DataFrame) -> Optional[pd.DataFrame]:
+    if interval == "raw":
+        frame = new_rows.tail(MAX_ROWS)
+        if device == "wise4012":
+            frame = dropbox_service.convert_bioelectric_voltage(frame.copy())
+        return frame
+
+    # Only the buckets the new rows fall into (they were already folded in)
+    since = new_rows["timestamp"].min().floor(rollups.ROLLUP_FREQS[interval])
+    agg = rollups.query_mean(device, interval, since=since)
+    if agg is None or agg.empty:
+        return None
+    return agg.tail(MAX_ROWS)
+
+
+def _encode(device: str, interval: str, new_rows: pd.DataFrame, version: int) -> Optional[Tuple[str, str]]:
+    frame = _frame_for(device, interval, new_rows)
+    if frame is None or frame.empty:
+        return None
+    rows = frame.to_json(orient="records", date_format="iso")
+    head = json.dumps({"device": device, "interval": interval, "version": version})
+    return f"{device}.{version}", f'{head[:-1]}, "rows": {rows}}}'
+
+
+def publish(device: str, new_rows: pd.DataFrame) -> None:
+    """
+    Ingest listener: encode once per interval, fan out to every matching subscriber.
+    """
+    with _lock:
+        targets = [sub for sub in _subscribers if device in sub["devices"]]
+    if not targets:
+        return
+
+    version, _ = dropbox_service.get_data_version(device)
+    messages: Dict[str, Optional[Tuple[str, str]]] = {}
+    for sub in targets:
+        interval = sub["interval"]
+        if interval not in messages:
+            messages[interval] = _encode(device, interval, new_rows, version)
+        if messages[interval] is None:
+            continue
+        try:
+            sub["loop"].call_soon_threadsafe(_offer, sub["queue"], messages[interval])
+        except RuntimeError:
+            # event loop already closed (shutdown); drop the subscriber
+            unsubscribe(sub)
+
+
+dropbox_service.add_ingest_listener(publish)
@@ -1,8 +1,9 @@
 # backend/api/router.py
 from fastapi import APIRouter
-from backend.api.routes import carbon_routes, chat_routes
+from backend.api.routes import carbon_routes, chat_routes, live_routes
 
 api_router = APIRouter()
 
 api_router.include_router(carbon_routes.router)
-api_router.include_router(chat_routes.router)
\ No newline at end of file
+api_router.include_router(chat_routes.router)
+api_router.include_router(live_routes.router)
\ No newline at end of file
@@ -1,10 +1,18 @@
-from fastapi import APIRouter, Query, HTTPException
-from typing import Optional, Literal
-import asyncio
-from concurrent.futures import ThreadPoolExecutor
-
+from fastapi import APIRouter, Query, HTTPException, Response, Header, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List, Optional, Literal
+from datetime import datetime
+
+from backend.api import conditional, encoding
+from backend.core import executor
+from backend.core.config import settings
 from backend.dropbox import service as dropbox_service
-from backend.api.routes.predict import get_carbon_prediction 
+from backend.api.routes.predict import (
+    get_carbon_forecast,
+    get_or_compute_prediction,
+    get_precomputed_prediction,
+)
 
 
 router = APIRouter(prefix="/carbon", tags=["carbon"])
@@ -13,44 +21,200 @@ router = APIRouter(prefix="/carbon", tags=["carbon"])
 # ============================================================
 #                       CO2 SECTION
 # ============================================================
-executor = ThreadPoolExecutor(max_workers=4)
+def encode_window(source, device, interval, start, end, after, limit, skip, tail, points, method, fmt, column=None):
+    """
+    Window + encoding of a sensor frame; runs on the io or cpu tier.
+    Returns (records or encoded bytes, next cursor).
+    """
+    part, next_cursor = dropbox_service.window_frame(
+        executor.frame(source), device, interval, start, end, after, limit, skip, tail, points, method,
+        column,
+    )
+    if fmt == "records":
+        return dropbox_service.df_to_records(part), next_cursor
+    return encoding.encode_body(part, fmt), next_cursor
+
+
+def is_heavy_window(limit: Optional[int], points: Optional[int]) -> bool:
+    return bool(points) or not limit or limit >= settings.CPU_OFFLOAD_MIN_ROWS
+
+
+def window_source(root_path, interval, start, end, heavy):
+    """
+    (source frame, its ship() handle or None); runs on the io tier.
+    Only cached frames are shipped to worker processes: their shared copy is
+    written once per data version, a one-off store range would be written
+    per request, so it is windowed on the io tier instead.
+    """
+    df, cached = dropbox_service.sensor_source(root_path, interval, start, end)
+    if heavy and (cached or not executor.uses_processes()):
+        return df, executor.ship(df)
+    return df, None
+
+
+async def window_records(
+    root_path, interval="raw", start=None, end=None, after=None, limit=None, skip=0,
+    tail=False, points=None, method="lttb", fmt="records", column=None,
+):
+    """
+    Encoded window (see slice_window) + next keyset cursor.
+    "records" returns plain dicts for FastAPI; other formats a ready Response.
+    The source frame is looked up on the io tier; large or downsampled
+    windows of a cached frame are cut and encoded on the cpu tier.
+    """
+    encoding.require(fmt)
+    device = dropbox_service.device_for_root(root_path)
+    args = (device, interval, start, end, after, limit, skip, tail, points, method, fmt, column)
+    try:
+        # df stays referenced until the cpu job returns (it owns the shared file)
+        df, shipped = await executor.run_io(
+            window_source, root_path, interval, start, end, is_heavy_window(limit, points)
+        )
+        if shipped is not None:
+            data, next_cursor = await executor.run_cpu(encode_window, shipped, *args)
+        else:
+            data, next_cursor = await executor.run_io(encode_window, df, *args)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if fmt == "records":
+        return data, next_cursor
+    return Response(content=data, media_type=encoding.MEDIA_TYPES[fmt]), next_cursor
+
+
+def check_not_modified(request: Request, device: str):
+    """
+    (304 response or None, validator headers) — runs before any pandas work.
+    """
+    cache_headers = conditional.validators(request, [device])
+    return conditional.not_modified(request, cache_headers), cache_headers
+
+
+def finish(response: Response, data, next_cursor: Optional[str] = None, cache_headers=None):
+    # Encoded formats come back as their own Response; headers go on that one
+    target = data if isinstance(data, Response) else response
+    conditional.apply(target, cache_headers)
+    if next_cursor:
+        target.headers["X-Next-Cursor"] = next_cursor
+    return data
+
+
+FormatQuery = Query(None, alias="format", description="records (default) | columns | arrow | msgpack")
+
 
 @router.get("/co2/all", summary="CO2 raw data from WISE-4051 (all)")
 async def co2_all_raw(
+    request: Request,
+    response: Response,
     limit: Optional[int] = Query(100, ge=1, le=166740, description="Limit number of results"),
-    interval: Optional[Literal["raw", "1min", "5min", "15min", "30min", "1hour"]] = Query("5min", description="Data aggregation interval")
+    interval: Optional[Literal["raw", "1min", "5min", "15min", "30min", "1hour", "1day"]] = Query("5min", description="Data aggregation interval"),
+    start: Optional[datetime] = Query(None, description="Window start (ISO 8601, inclusive)"),
+    end: Optional[datetime] = Query(None, description="Window end (ISO 8601, inclusive)"),
+    after: Optional[str] = Query(None, description="Cursor from a previous X-Next-Cursor header"),
+    points: Optional[int] = Query(None, ge=3, le=10000, description="Downsample the window to ~N chart points"),
+    downsample: Literal["lttb", "minmax"] = Query("lttb", description="Downsampling method used with points"),
+    fmt: Optional[Literal["records", "columns", "arrow", "msgpack"]] = FormatQuery,
+    accept: Optional[str] = Header(None),
 ):
-    # Run the blocking Dropbox/pandas operations in a thread pool
-    loop = asyncio.get_event_loop()
-    data = await loop.run_in_executor(
-        executor,
-        dropbox_service.get_co2_all_raw,
-        limit,
-        interval
+    not_modified, cache_headers = check_not_modified(request, "wise4051")
+    if not_modified:
+        return not_modified
+
+    fmt = encoding.negotiate(fmt, accept)
+    # Blocking Dropbox/pandas work runs on the io / cpu tiers (core/executor.py)
+    data, next_cursor = await window_records(
+        dropbox_service.WISE4051_ROOT, interval, start, end, after, limit,
+        tail=True, points=points, method=downsample, fmt=fmt,
     )
-    return data
+    return finish(response, data, next_cursor, cache_headers)
 
 
 @router.get("/elec/all", summary="CO2 raw data from WISE-4051 (all)")
-async def co2_all_raw(
+async def elec_all_raw(
+    request: Request,
+    response: Response,
     limit: Optional[int] = Query(100, ge=1, le=166740, description="Limit number of results"),
-    interval: Optional[Literal["raw", "1min", "5min", "15min", "30min", "1hour"]] = Query("5min", description="Data aggregation interval")
+    interval: Optional[Literal["raw", "1min", "5min", "15min", "30min", "1hour", "1day"]] = Query("5min", description="Data aggregation interval"),
+    start: Optional[datetime] = Query(None, description="Window start (ISO 8601, inclusive)"),
+    end: Optional[datetime] = Query(None, description="Window end (ISO 8601, inclusive)"),
+    after: Optional[str] = Query(None, description="Cursor from a previous X-Next-Cursor header"),
+    points: Optional[int] = Query(None, ge=3, le=10000, description="Downsample the window to ~N chart points"),
+    downsample: Literal["lttb", "minmax"] = Query("lttb", description="Downsampling method used with points"),
+    fmt: Optional[Literal["records", "columns", "arrow", "msgpack"]] = FormatQuery,
+    accept: Optional[str] = Header(None),
 ):
-    # Run the blocking Dropbox/pandas operations in a thread pool
-    loop = asyncio.get_event_loop()
-    data = await loop.run_in_executor(
-        executor,
-        dropbox_service.get_elec_all_raw,
-        limit,
-        interval
+    not_modified, cache_headers = check_not_modified(request, "wise4012")
+    if not_modified:
+        return not_modified
+
+    fmt = encoding.negotiate(fmt, accept)
+    # Blocking Dropbox/pandas work runs on the io / cpu tiers (core/executor.py)
+    data, next_cursor = await window_records(
+        dropbox_service.WISE4012_ROOT, interval, start, end, after, limit,
+        tail=True, points=points, method=downsample, fmt=fmt,
     )
-    return data
+    return finish(response, data, next_cursor, cache_headers)
+
+def export_response(root_path, device, interval, start, end, fmt, gzip):
+    """
+    StreamingResponse over a window of the cached/stored frame. The window is
+    a slice (no copy); rows are serialised chunk by chunk as the client reads.
+    """
+    if interval == "raw":
+        df, _ = dropbox_service.slice_window(
+            dropbox_service.read_all_csv_under(root_path), start, end
+        )
+    else:
+        df, _ = dropbox_service.get_sensor_frame(root_path, interval, start, end)
+
+    transform = None
+    if interval == "raw" and device == "wise4012":
+        transform = dropbox_service.convert_bioelectric_voltage
+
+    chunks = encoding.iter_export(df, fmt, transform=transform)
+    filename = f"{device}.{fmt}"
+    media_type = encoding.EXPORT_MEDIA_TYPES[fmt]
+    if gzip:
+        chunks = encoding.gzip_stream(chunks)
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/co2/export", summary="Stream WISE-4051 data as NDJSON / CSV")
+def co2_export(
+    interval: Literal["raw", "1min", "5min", "15min", "30min", "1hour", "1day"] = "raw",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    gzip: bool = False,
+):
+    return export_response(dropbox_service.WISE4051_ROOT, "wise4051", interval, start, end, fmt, gzip)
+
+
+@router.get("/elec/export", summary="Stream WISE-4012 data as NDJSON / CSV")
+def elec_export(
+    interval: Literal["raw", "1min", "5min", "15min", "30min", "1hour", "1day"] = "raw",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    gzip: bool = False,
+):
+    return export_response(dropbox_service.WISE4012_ROOT, "wise4012", interval, start, end, fmt, gzip)
+
 
 @router.get("/co2/predict")
-async def co2_predict():
-    # 1. Use asyncio.to_thread() to run the synchronous function in a thread pool.
-    #    This ensures the main FastAPI event loop is NOT blocked.
-    result = await asyncio.to_thread(get_carbon_prediction)
+async def co2_predict(force_refresh: bool = False):
+    # 1. Serve the prediction precomputed at ingest when it is current (no I/O);
+    #    otherwise compute in a thread pool so the event loop is NOT blocked.
+    result = None if force_refresh else get_precomputed_prediction()
+    if result is None:
+        result = await executor.run_io(get_or_compute_prediction, force_refresh)
     
     # 2. Check for errors returned by the service function
     if "error" in result:
@@ -60,33 +224,91 @@ async def co2_predict():
     # 3. Return the structured result
     return result
 
+class ForecastSensor(BaseModel):
+    name: str
+    co2: Optional[float] = None
+    temperature: Optional[float] = None
+    humidity: Optional[float] = None
+    light_intensity: Optional[float] = None
+    lux: Optional[float] = None
+
+
+class ForecastRequest(BaseModel):
+    horizon_minutes: int = 60
+    step_minutes: int = Field(5, ge=5, le=60, multiple_of=5)
+    sensors: Optional[List[ForecastSensor]] = None
+
+
+async def run_forecast(horizon_minutes: int, step_minutes: int, sensors=None):
+    # io tier: scoring uses the server's warm models (the registry reloads them
+    # when a retrain lands); cpu workers would each hold a stale copy
+    result = await executor.run_io(get_carbon_forecast, horizon_minutes, step_minutes, sensors)
+    if "error" in result:
+        raise HTTPException(status_code=500, detail=result["error"])
+    return result
+
+
+@router.get("/co2/forecast", summary="CO2 forecast curve (5-minute model steps, reported every step_minutes)")
+async def co2_forecast(
+    horizon_minutes: int = Query(60, ge=1, le=1440),
+    step_minutes: int = Query(5, ge=5, le=60, multiple_of=5),
+):
+    return await run_forecast(horizon_minutes, step_minutes)
+
+
+@router.post("/co2/forecast", summary="CO2 forecast for several sensors in one batched pass")
+async def co2_forecast_batch(req: ForecastRequest):
+    sensors = [sensor.model_dump() for sensor in req.sensors] if req.sensors else None
+    return await run_forecast(req.horizon_minutes, req.step_minutes, sensors)
+
+
 @router.get("/co2/hourly", summary="CO2 hourly average from WISE-4051")
-def co2_hourly():
-    return dropbox_service.get_co2_all_hourly()
+async def co2_hourly():
+    return await executor.run_io(dropbox_service.get_co2_all_hourly)
 
 
 @router.get("/co2/daily", summary="CO2 daily average from WISE-4051")
-def co2_daily():
-    return dropbox_service.get_co2_daily()
+async def co2_daily():
+    return await executor.run_io(dropbox_service.get_co2_daily)
 
 
 @router.get("/co2/count", summary="Count CO2 records quickly")
-def co2_count():
-    df = dropbox_service.read_all_csv_under(dropbox_service.WISE4051_ROOT)
-    return {"rows": int(len(df))}
+async def co2_count(request: Request, response: Response):
+    not_modified, cache_headers = check_not_modified(request, "wise4051")
+    if not_modified:
+        return not_modified
+
+    df = await executor.run_io(dropbox_service.read_all_csv_under, dropbox_service.WISE4051_ROOT)
+    return finish(response, {"rows": int(len(df))}, cache_headers=cache_headers)
 
 
 @router.get("/co2/page", summary="CO2 page-by-page for large datasets")
-def co2_page(skip: int = 0, limit: int = 500):
-    df = dropbox_service.read_all_csv_under(dropbox_service.WISE4051_ROOT)
-    part = df.iloc[skip: skip + limit]
-    return part.to_dict(orient="records")
+async def co2_page(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 500,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    after: Optional[str] = None,
+    fmt: Optional[Literal["records", "columns", "arrow", "msgpack"]] = FormatQuery,
+    accept: Optional[str] = Header(None),
+):
+    not_modified, cache_headers = check_not_modified(request, "wise4051")
+    if not_modified:
+        return not_modified
+
+    data, next_cursor = await window_records(
+        dropbox_service.WISE4051_ROOT, "raw", start, end, after, limit, skip,
+        fmt=encoding.negotiate(fmt, accept),
+    )
+    return finish(response, data, next_cursor, cache_headers)
 
 
 @router.get("/co2/debug", summary="CO2 debug (sample, rows, columns)")
-def co2_debug():
+async def co2_debug():
     try:
-        df = dropbox_service.read_all_csv_under(dropbox_service.WISE4051_ROOT)
+        df = await executor.run_io(dropbox_service.read_all_csv_under, dropbox_service.WISE4051_ROOT)
         return {
             "rows": int(len(df)),
             "columns": list(df.columns),
@@ -96,42 +318,88 @@ def co2_debug():
         return {"error": str(e)}
 
 
+@router.get("/cache/stats", summary="Shared cache hits / misses / evictions / bytes")
+def cache_stats():
+    return dropbox_service.get_cache_stats()
+
+
 # ============================================================
 #                   TEMPERATURE SECTION
 # ============================================================
 
-@router.get("/temp/all", summary="Temperature raw data from WISE-4012 (all)")
-def temp_all_raw():
-    return dropbox_service.get_temp_all_raw()
+@router.get("/temp/all", summary="Temperature raw data from WISE-4051 (all)")
+async def temp_all_raw(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(100, ge=1, le=166740, description="Limit number of results"),
+    interval: Optional[Literal["raw", "1min", "5min", "15min", "30min", "1hour", "1day"]] = Query("5min", description="Data aggregation interval"),
+    start: Optional[datetime] = Query(None, description="Window start (ISO 8601, inclusive)"),
+    end: Optional[datetime] = Query(None, description="Window end (ISO 8601, inclusive)"),
+    after: Optional[str] = Query(None, description="Cursor from a previous X-Next-Cursor header"),
+    points: Optional[int] = Query(None, ge=3, le=10000, description="Downsample the window to ~N chart points"),
+    downsample: Literal["lttb", "minmax"] = Query("lttb", description="Downsampling method used with points"),
+    fmt: Optional[Literal["records", "columns", "arrow", "msgpack"]] = FormatQuery,
+    accept: Optional[str] = Header(None),
+):
+    not_modified, cache_headers = check_not_modified(request, "wise4051")
+    if not_modified:
+        return not_modified
+
+    fmt = encoding.negotiate(fmt, accept)
+    data, next_cursor = await window_records(
+        dropbox_service.WISE4051_ROOT, interval, start, end, after, limit,
+        tail=True, points=points, method=downsample, fmt=fmt, column=dropbox_service.TEMP_COL,
+    )
+    return finish(response, data, next_cursor, cache_headers)
 
 
-@router.get("/temp/hourly", summary="Temperature hourly average from WISE-4012")
-def temp_hourly():
-    return dropbox_service.get_temp_all_hourly()
+@router.get("/temp/hourly", summary="Temperature hourly average from WISE-4051")
+async def temp_hourly():
+    return await executor.run_io(dropbox_service.get_temp_all_hourly)
 
 
-@router.get("/temp/daily", summary="Temperature daily average from WISE-4012")
-def temp_daily():
-    return dropbox_service.get_temp_daily()
+@router.get("/temp/daily", summary="Temperature daily average from WISE-4051")
+async def temp_daily():
+    return await executor.run_io(dropbox_service.get_temp_daily)
 
 
 @router.get("/temp/count", summary="Count temp records quickly")
-def temp_count():
-    df = dropbox_service.read_all_csv_under(dropbox_service.WISE4012_ROOT)
-    return {"rows": int(len(df))}
+async def temp_count(request: Request, response: Response):
+    not_modified, cache_headers = check_not_modified(request, "wise4051")
+    if not_modified:
+        return not_modified
+
+    df = await executor.run_io(dropbox_service.read_all_csv_under, dropbox_service.WISE4051_ROOT)
+    return finish(response, {"rows": int(len(df))}, cache_headers=cache_headers)
 
 
 @router.get("/temp/page", summary="Temperature data by page")
-def temp_page(skip: int = 0, limit: int = 500):
-    df = dropbox_service.read_all_csv_under(dropbox_service.WISE4012_ROOT)
-    part = df.iloc[skip: skip + limit]
-    return part.to_dict(orient="records")
+async def temp_page(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 500,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    after: Optional[str] = None,
+    fmt: Optional[Literal["records", "columns", "arrow", "msgpack"]] = FormatQuery,
+    accept: Optional[str] = Header(None),
+):
+    not_modified, cache_headers = check_not_modified(request, "wise4051")
+    if not_modified:
+        return not_modified
+
+    data, next_cursor = await window_records(
+        dropbox_service.WISE4051_ROOT, "raw", start, end, after, limit, skip,
+        fmt=encoding.negotiate(fmt, accept), column=dropbox_service.TEMP_COL,
+    )
+    return finish(response, data, next_cursor, cache_headers)
 
 
 @router.get("/temp/debug", summary="Temperature debug (sample, rows, columns)")
-def temp_debug():
+async def temp_debug():
     try:
-        df = dropbox_service.read_all_csv_under(dropbox_service.WISE4012_ROOT)
+        df = await executor.run_io(dropbox_service.read_all_csv_under, dropbox_service.WISE4051_ROOT)
         return {
             "rows": int(len(df)),
             "columns": list(df.columns),
@@ -145,38 +413,79 @@ def temp_debug():
 #                     HUMIDITY SECTION
 # ============================================================
 
-@router.get("/humid/all", summary="Humidity raw data from WISE-4012 (all)")
-def humid_all_raw():
-    return dropbox_service.get_humid_all_raw()
+@router.get("/humid/all", summary="Humidity raw data from WISE-4051 (all)")
+async def humid_all_raw(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(100, ge=1, le=166740, description="Limit number of results"),
+    interval: Optional[Literal["raw", "1min", "5min", "15min", "30min", "1hour", "1day"]] = Query("5min", description="Data aggregation interval"),
+    start: Optional[datetime] = Query(None, description="Window start (ISO 8601, inclusive)"),
+    end: Optional[datetime] = Query(None, description="Window end (ISO 8601, inclusive)"),
+    after: Optional[str] = Query(None, description="Cursor from a previous X-Next-Cursor header"),
+    points: Optional[int] = Query(None, ge=3, le=10000, description="Downsample the window to ~N chart points"),
+    downsample: Literal["lttb", "minmax"] = Query("lttb", description="Downsampling method used with points"),
+    fmt: Optional[Literal["records", "columns", "arrow", "msgpack"]] = FormatQuery,
+    accept: Optional[str] = Header(None),
+):
+    not_modified, cache_headers = check_not_modified(request, "wise4051")
+    if not_modified:
+        return not_modified
+
+    fmt = encoding.negotiate(fmt, accept)
+    data, next_cursor = await window_records(
+        dropbox_service.WISE4051_ROOT, interval, start, end, after, limit,
+        tail=True, points=points, method=downsample, fmt=fmt, column=dropbox_service.HUMID_COL,
+    )
+    return finish(response, data, next_cursor, cache_headers)
 
 
-@router.get("/humid/hourly", summary="Humidity hourly average from WISE-4012")
-def humid_hourly():
-    return dropbox_service.get_humid_all_hourly()
+@router.get("/humid/hourly", summary="Humidity hourly average from WISE-4051")
+async def humid_hourly():
+    return await executor.run_io(dropbox_service.get_humid_all_hourly)
 
 
-@router.get("/humid/daily", summary="Humidity daily average from WISE-4012")
-def humid_daily():
-    return dropbox_service.get_humid_daily()
+@router.get("/humid/daily", summary="Humidity daily average from WISE-4051")
+async def humid_daily():
+    return await executor.run_io(dropbox_service.get_humid_daily)
 
 
 @router.get("/humid/count", summary="Count humidity records quickly")
-def humid_count():
-    df = dropbox_service.read_all_csv_under(dropbox_service.WISE4012_ROOT)
-    return {"rows": int(len(df))}
+async def humid_count(request: Request, response: Response):
+    not_modified, cache_headers = check_not_modified(request, "wise4051")
+    if not_modified:
+        return not_modified
+
+    df = await executor.run_io(dropbox_service.read_all_csv_under, dropbox_service.WISE4051_ROOT)
+    return finish(response, {"rows": int(len(df))}, cache_headers=cache_headers)
 
 
 @router.get("/humid/page", summary="Humidity data page-by-page")
-def humid_page(skip: int = 0, limit: int = 500):
-    df = dropbox_service.read_all_csv_under(dropbox_service.WISE4012_ROOT)
-    part = df.iloc[skip: skip + limit]
-    return part.to_dict(orient="records")
+async def humid_page(
+    request: Request,
+    response: Response,
+    skip: int = 0,
+    limit: int = 500,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    after: Optional[str] = None,
+    fmt: Optional[Literal["records", "columns", "arrow", "msgpack"]] = FormatQuery,
+    accept: Optional[str] = Header(None),
+):
+    not_modified, cache_headers = check_not_modified(request, "wise4051")
+    if not_modified:
+        return not_modified
+
+    data, next_cursor = await window_records(
+        dropbox_service.WISE4051_ROOT, "raw", start, end, after, limit, skip,
+        fmt=encoding.negotiate(fmt, accept), column=dropbox_service.HUMID_COL,
+    )
+    return finish(response, data, next_cursor, cache_headers)
 
 
 @router.get("/humid/debug", summary="Humidity debug (sample, rows, columns)")
-def humid_debug():
+async def humid_debug():
     try:
-        df = dropbox_service.read_all_csv_under(dropbox_service.WISE4012_ROOT)
+        df = await executor.run_io(dropbox_service.read_all_csv_under, dropbox_service.WISE4051_ROOT)
         return {
             "rows": int(len(df)),
             "columns": list(df.columns),
@@ -1,23 +1,89 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from typing import Optional
+import json
 
-from backend.core.ollama_service import ask_carbon_status_ollama
+from backend.core import ollama_service
+from backend.core.ollama_service import (
+    AdmissionError,
+    ask_carbon_status_ollama,
+    deadline_for,
+    stream_carbon_status_ollama,
+)
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
 class ChatRequest(BaseModel):
     message: str
+    # Seconds the request may wait for a free generation slot (server default / cap apply)
+    deadline_seconds: Optional[float] = None
 
 class ChatResponse(BaseModel):
     reply: str
 
+def admission_error(e: AdmissionError) -> HTTPException:
+    # 429 queue full / 503 deadline passed while queued; both retryable
+    return HTTPException(
+        status_code=e.status_code,
+        detail=e.detail,
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
 @router.post("/carbon-status", response_model=ChatResponse)
-def chat_carbon_status(req: ChatRequest):
+async def chat_carbon_status(req: ChatRequest):
     try:
-        reply = ask_carbon_status_ollama(req.message)
+        reply = await ask_carbon_status_ollama(req.message, deadline_for(req.deadline_seconds))
         return ChatResponse(reply=reply)
+    except AdmissionError as e:
+        raise admission_error(e)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"เกิดข้อผิดพลาดในการเรียก Ollama: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.post("/carbon-status/stream", summary="Carbon status reply streamed token by token (SSE)")
+async def chat_carbon_status_stream(req: ChatRequest):
+    """
+    SSE: one `token` event per generated chunk (data is a JSON string), then
+    `done`. Errors before the first token are a 500 as for /carbon-status;
+    later ones arrive as an `error` event.
+    """
+    tokens = stream_carbon_status_ollama(req.message, deadline_for(req.deadline_seconds))
+    try:
+        # Wait for the first token so admission / connection / model errors
+        # still get a status code
+        first = await anext(tokens, None)
+    except AdmissionError as e:
+        raise admission_error(e)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"เกิดข้อผิดพลาดในการเรียก Ollama: {str(e)}"
+        )
+
+    async def events():
+        try:
+            if first is not None:
+                yield f"event: token\ndata: {json.dumps(first, ensure_ascii=False)}\n\n"
+            async for token in tokens:
+                yield f"event: token\ndata: {json.dumps(token, ensure_ascii=False)}\n\n"
+            yield "event: done\ndata: {}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps(str(e), ensure_ascii=False)}\n\n"
+        finally:
+            await tokens.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/metrics", summary="LLM queue depth, wait times, rejections, warmup state")
+def chat_metrics():
+    return ollama_service.metrics()
@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from typing import List, Literal
+import asyncio
+
+from backend.api import live
+
+
+router = APIRouter(prefix="/carbon/live", tags=["live"])
+
+DeviceQuery = Query(list(live.LIVE_DEVICES), description="Devices to receive (repeatable)")
+Interval = Literal["raw", "1min", "5min", "15min", "30min", "1hour", "1day"]
+
+
+# ============================================================
+#                    SERVER-SENT EVENTS
+# ============================================================
+@router.get("", summary="Live feed of newly ingested rows (SSE)")
+async def live_sse(
+    request: Request,
+    device: List[Literal["wise4051", "wise4012"]] = DeviceQuery,
+    interval: Interval = "raw",
+):
+    sub = live.subscribe(device, interval)
+
+    async def stream():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    event_id, data = await asyncio.wait_for(
+                        sub["queue"].get(), timeout=live.HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"id: {event_id}\nevent: rows\ndata: {data}\n\n"
+        finally:
+            live.unsubscribe(sub)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ============================================================
+#                        WEBSOCKET
+# ============================================================
+@router.websocket("/ws")
+async def live_ws(
+    websocket: WebSocket,
+    device: List[Literal["wise4051", "wise4012"]] = DeviceQuery,
+    interval: Interval = "raw",
+):
+    await websocket.accept()
+    sub = live.subscribe(device, interval)
+
+    async def pump():
+        while True:
+            _, data = await sub["queue"].get()
+            await websocket.send_text(data)
+
+    sender = asyncio.create_task(pump())
+    try:
+        # Inbound messages are ignored; receiving only detects the disconnect
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        live.unsubscribe(sub)
@@ -1,17 +1,20 @@
-import io
+import time
 import warnings
 import os
-from typing import List, Dict, Optional, Literal, Any
-from datetime import datetime
+from typing import Dict, List, Optional, Any
 
-import dropbox
 import pandas as pd
 import numpy as np
-from autogluon.tabular import TabularPredictor
-from sklearn.preprocessing import StandardScaler
 
 # --- Environment Variables (Assumed to be defined in backend.dropbox.env) ---
-from backend.dropbox.env import DROPBOX_TOKEN, WISE4051_ROOT, WISE4012_ROOT
+from backend.dropbox.env import WISE4051_ROOT
+# Same ingested frames the data endpoints serve (no Dropbox I/O here)
+from backend.dropbox.service import add_ingest_listener, read_ingested
+# Input frames come from the shared ingested store; the shared cache also
+# holds the precomputed prediction below
+from backend.core import feature_stats, model_registry, singleflight
+from backend.core.cache import cache
+from backend.core.feature_engine import LOOKBACK_ROWS, TailFeatureEngine
 
 # Suppress AutoGluon/Pandas warnings during inference
 warnings.filterwarnings('ignore', category=UserWarning)
@@ -22,8 +25,22 @@ warnings.filterwarnings('ignore', category=FutureWarning)
 # ─────────────────────────────────────────────────────────────
 
 # NOTE: These paths must be accessible relative to where the service is run
-MODEL_PATH_RATE_CHANGE = './autogluon_models_rate_change'
-MODEL_PATH_RATE_PER_HOUR = './autogluon_models_rate_per_hour'
+MODEL_PATH_RATE_CHANGE = os.getenv("MODEL_PATH_RATE_CHANGE", './autogluon_models_rate_change')
+MODEL_PATH_RATE_PER_HOUR = os.getenv("MODEL_PATH_RATE_PER_HOUR", './autogluon_models_rate_per_hour')
+
+MODEL_DIRS = {
+    "rate_change": MODEL_PATH_RATE_CHANGE,
+    "rate_per_hour": MODEL_PATH_RATE_PER_HOUR,
+}
+
+# Loaded once and kept warm (hot-swapped when version.txt changes)
+for _name, _path in MODEL_DIRS.items():
+    model_registry.register(_name, _path)
+
+# Rows of history a feature row depends on (lag5, rolling 10 + shift 1)
+FEATURE_LOOKBACK_ROWS = LOOKBACK_ROWS
+# Latest rows considered for the prediction input (the last clean one is used)
+PREDICTION_CANDIDATE_ROWS = 11
 
 # Define the numerical features that were scaled during training
 SCALED_NUMERICAL_FEATURES = [
@@ -66,136 +83,14 @@ HUMID_COL = "COM_1 Wd_2"
 LEAF_COL = "AI_0 Val"
 GROUND_COL = "AI_1 Val"
 
-# ─────────────────────────────────────────────────────────────
-# CACHE
-# ─────────────────────────────────────────────────────────────
-_cache: Dict[str, pd.DataFrame] = {}
-_sensor_cache = {
-    "wise4051": {"data": None, "last_updated": None},
-    "wise4012": {"data": None, "last_updated": None},
-}
-
-
-# ─────────────────────────────────────────────────────────────
-# Dropbox Utils (kept as provided by user)
-# ─────────────────────────────────────────────────────────────
-def get_client() -> dropbox.Dropbox:
-    return dropbox.Dropbox(DROPBOX_TOKEN)
-
-def list_date_folders(root_path: str) -> List[str]:
-    dbx = get_client()
-    res = dbx.files_list_folder(root_path)
-    folders: List[str] = []
-    while True:
-        for entry in res.entries:
-            if isinstance(entry, dropbox.files.FolderMetadata):
-                folders.append(entry.path_display)
-        if not res.has_more:
-            break
-        res = dbx.files_list_folder_continue(res.cursor)
-    return folders
-
-def list_csv_files(dbx: dropbox.Dropbox, folder_path: str) -> List[str]:
-    res = dbx.files_list_folder(folder_path)
-    files: List[str] = []
-    while True:
-        for entry in res.entries:
-            if isinstance(entry, dropbox.files.FileMetadata) and entry.name.lower().endswith(
-                ".csv"
-            ):
-                files.append(entry.path_display)
-        if not res.has_more:
-            break
-        res = dbx.files_list_folder_continue(res.cursor)
-    return files
-
-def download_csv_to_df(dbx: dropbox.Dropbox, file_path: str) -> pd.DataFrame:
-    _, resp = dbx.files_download(file_path)
-    content = resp.content.decode("utf-8", errors="ignore")
-    df = pd.read_csv(io.StringIO(content))
-    return df
-
-def add_timestamp_column(df: pd.DataFrame) -> pd.DataFrame:
-    # Logic to create 'timestamp' column from various formats...
-    if "timestamp" in df.columns:
-        return df
-    if "TIM" in df.columns:
-        df["timestamp"] = pd.to_datetime(df["TIM"], errors="coerce")
-        return df
-
-    cols = {
-        "year": ["Year", "YEAR", "year"],
-        "month": ["Month", "MONTH", "month"],
-        "day": ["Day", "DAY", "day"],
-        "hour": ["Hour", "HOUR", "hour"],
-        "minute": ["Minute", "MINUTE", "minute"],
-        "second": ["Second", "SECOND", "second"],
-    }
-    def pick(name):
-        for c in cols[name]:
-            if c in df.columns:
-                return c
-        return None
-    y, m, d = pick("year"), pick("month"), pick("day")
-    h, mn, s = pick("hour"), pick("minute"), pick("second")
-    if all([y, m, d, h, mn, s]):
-        df["timestamp"] = pd.to_datetime(
-            dict(
-                year=df[y], month=df[m], day=df[d],
-                hour=df[h], minute=df[mn], second=df[s],
-            ),
-            errors="coerce",
-        )
-        return df
-    if "Time" in df.columns:
-        df["timestamp"] = pd.to_datetime(df["Time"], errors="coerce")
-        return df
-    raise ValueError("Cannot detect timestamp columns in CSV.")
-
-def read_all_csv_under(
-    root_path: str,
-    use_cache: bool = True,
-    skip_old_data: bool = True,
-) -> pd.DataFrame:
-    if use_cache and root_path in _cache:
-        print(f"✅ Using cached data for {root_path}")
-        return _cache[root_path]
-
-    print(f"📥 Reading fresh data from Dropbox: {root_path}")
-    dbx = get_client()
-    all_rows: List[pd.DataFrame] = []
-    folders = list_date_folders(root_path)
-    if skip_old_data and len(folders) > 7:
-        folders = sorted(folders)[-7:]
-
-    for folder in folders:
-        csv_files = list_csv_files(dbx, folder)
-        for file_path in csv_files:
-            try:
-                df = download_csv_to_df(dbx, file_path)
-                df = add_timestamp_column(df)
-                all_rows.append(df)
-            except Exception as e:
-                print(f"⚠️ Failed to read {file_path}: {e}")
-
-    if not all_rows:
-        return pd.DataFrame()
-
-    print(f"🔄 Concatenating {len(all_rows)} dataframes...")
-    df_all = pd.concat(all_rows, ignore_index=True)
-    df_all = df_all.sort_values("timestamp").reset_index(drop=True)
-
-    if use_cache:
-        _cache[root_path] = df_all
-        print(f"💾 Cached {len(df_all)} rows")
-
-    return df_all
-
 # ─────────────────────────────────────────────────────────────
 # AI FEATURE ENGINEERING (Restored the safe version)
 # ─────────────────────────────────────────────────────────────
-def create_advanced_features(df: pd.DataFrame) -> pd.DataFrame:
-    """Create sophisticated features for carbon prediction WITHOUT data leakage"""
+def create_advanced_features(df: pd.DataFrame, carbon_stats: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+    """Create sophisticated features for carbon prediction WITHOUT data leakage
+
+    carbon_stats: stored {"mean", "std"} for carbon_zscore; defaults to this frame's.
+    """
     df = df.copy()
 
     # Rename 'timestamp' to 'TIM' for consistency with training
@@ -266,63 +161,146 @@ def create_advanced_features(df: pd.DataFrame) -> pd.DataFrame:
     df['day_cos'] = np.cos(2 * np.pi * df['day_of_week']/7)
 
     # Statistical features
-    df['carbon_zscore'] = (df['carbon'] - df['carbon'].mean()) / df['carbon'].std()
+    if carbon_stats is None:
+        carbon_stats = feature_stats.carbon_stats(df['carbon'])
+    df['carbon_zscore'] = (df['carbon'] - carbon_stats['mean']) / carbon_stats['std']
 
     return df
 
+# ─────────────────────────────────────────────────────────────
+# STREAMING FEATURES (fed at ingest, O(window) per row)
+# ─────────────────────────────────────────────────────────────
+def prepare_sensor_frame(df_raw: pd.DataFrame) -> pd.DataFrame:
+    """Drop unused WISE-4051 words and rename to the model's input names."""
+    df_clean = df_raw.drop(columns=[
+        "COM_1 Wd_0 Evt","COM_1 Wd_1 Evt","COM_1 Wd_2 Evt",
+        "COM_1 Wd_3","COM_1 Wd_3 Evt","COM_1 Wd_4 Evt",
+        "COM_1 Wd_5","COM_1 Wd_5 Evt","COM_1 Wd_6 Evt","COM_1 Wd_7","COM_1 Wd_7 Evt"
+    ], errors='ignore')
+    return df_clean.rename(columns={
+        "COM_1 Wd_0": "carbon",
+        "COM_1 Wd_1": "Temp",
+        "COM_1 Wd_2": "Humidity",
+        "COM_1 Wd_4": "light_intensity", # Use snake_case for internal consistency
+        "COM_1 Wd_6": "lux"
+    })
+
+
+_tail_features = TailFeatureEngine(keep_rows=PREDICTION_CANDIDATE_ROWS)
+
+
+def _on_ingest(device: str, new_rows: pd.DataFrame) -> None:
+    if device != "wise4051":
+        return
+    if not _tail_features.extend(prepare_sensor_frame(new_rows)):
+        # late / out-of-order rows: rebuilt from the frame tail on next prediction
+        _tail_features.reset()
+
+    # The answer only changes when a WISE-4051 row arrives: compute it now
+    frame = cache.peek(("frame", WISE4051_ROOT))
+    if frame is not None and not frame.empty:
+        precompute_prediction(frame)
+
+
+add_ingest_listener(_on_ingest)
+
+
+def tail_features(df_clean: pd.DataFrame, carbon_stats: Dict[str, float]) -> pd.DataFrame:
+    """
+    Feature rows for the last PREDICTION_CANDIDATE_ROWS samples of df_clean.
+    Uses the ingest-fed engine when it is in sync, else rebuilds it from the
+    tail (PREDICTION_CANDIDATE_ROWS + FEATURE_LOOKBACK_ROWS rows).
+    """
+    df_tail = df_clean.iloc[-(PREDICTION_CANDIDATE_ROWS + FEATURE_LOOKBACK_ROWS):]
+    return _tail_features.sync(df_tail, carbon_stats)
+
+
+# ─────────────────────────────────────────────────────────────
+# FEATURE STATISTICS (scaler + z-score, stored with the models)
+# ─────────────────────────────────────────────────────────────
+def load_feature_stats() -> Dict:
+    """
+    Stored feature statistics of the loaded models, fitted on the training
+    data for the served model version (scripts/fit_feature_stats.py).
+    """
+    for name in MODEL_DIRS:
+        stats = model_registry.get_feature_stats(name)
+        if stats is not None:
+            return stats
+    raise FileNotFoundError(
+        f"no {feature_stats.FEATURE_STATS_FILE} matching the model version; "
+        "run python -m backend.scripts.fit_feature_stats on the training data"
+    )
+
+
+def fit_feature_stats(df_raw: pd.DataFrame, source: str, model_version: Optional[str]) -> Dict:
+    """
+    Feature statistics of a raw WISE-4051 training frame (offline, see
+    scripts/fit_feature_stats.py).
+    """
+    df_clean = prepare_sensor_frame(df_raw)
+    carbon = feature_stats.carbon_stats(df_clean['carbon'])
+    return feature_stats.fit(
+        create_advanced_features(df_clean, carbon), SCALED_NUMERICAL_FEATURES,
+        source=source, model_version=model_version,
+    )
+
+
+def build_model_inputs(df_raw: pd.DataFrame, stats: Dict) -> pd.DataFrame:
+    """
+    Batch path for offline use (benchmarks, model export): every feature row
+    of a raw WISE-4051 frame that has all model inputs, scaled with stats.
+    Columns outside the model inputs (e.g. a label) are kept.
+    """
+    df = create_advanced_features(prepare_sensor_frame(df_raw), stats["zscore"]["carbon"])
+    df = df.dropna(subset=PREDICTION_INPUT_COLUMNS).reset_index(drop=True)
+    return feature_stats.transform(df, stats)
+
+
 # ─────────────────────────────────────────────────────────────
 # AI SERVICE FUNCTION FOR FASTAPI
 # ─────────────────────────────────────────────────────────────
-def get_carbon_prediction(force_refresh: bool = False) -> Dict[str, Any]:
+def get_carbon_prediction(df_raw: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
     """
     Loads historical data, engineers features, and makes a dual-target carbon prediction.
+    Always computes; serving the precomputed result (or bypassing it with
+    force_refresh) is get_or_compute_prediction's job. Never re-downloads.
+    df_raw: already-loaded WISE-4051 frame (e.g. from ingest) to predict on.
     """
     try:
-        # 1. Load Data from Dropbox (using the user's utility)
-        df_raw = read_all_csv_under(WISE4051_ROOT, use_cache=not force_refresh)
+        # 1. Ingested WISE-4051 frame (in memory, else the local store)
+        if df_raw is None:
+            df_raw = read_ingested(WISE4051_ROOT)
 
         if df_raw.empty:
-            return {"error": "Failed to load any data from Dropbox."}
-
-        # 2. Data Cleaning and Renaming (from user's prepare_df logic)
-        df_clean = df_raw.drop(columns=[
-            "COM_1 Wd_0 Evt","COM_1 Wd_1 Evt","COM_1 Wd_2 Evt",
-            "COM_1 Wd_3","COM_1 Wd_3 Evt","COM_1 Wd_4 Evt",
-            "COM_1 Wd_5","COM_1 Wd_5 Evt","COM_1 Wd_6 Evt","COM_1 Wd_7","COM_1 Wd_7 Evt"
-        ], errors='ignore')
-        df_clean = df_clean.rename(columns={
-            "COM_1 Wd_0": "carbon",
-            "COM_1 Wd_1": "Temp",
-            "COM_1 Wd_2": "Humidity",
-            "COM_1 Wd_4": "light_intensity", # Use snake_case for internal consistency
-            "COM_1 Wd_6": "lux"
-        })
-
-        # 3. Feature Engineering (Creates lags, rolling stats, etc.)
-        df_processed = create_advanced_features(df_clean)
+            return {"error": "No WISE-4051 data has been ingested yet."}
+
+        # 2. Data Cleaning and Renaming (tail only)
+        df_clean = prepare_sensor_frame(
+            df_raw.iloc[-(PREDICTION_CANDIDATE_ROWS + FEATURE_LOOKBACK_ROWS):]
+        )
+
+        # 3. Warm models (their stored feature statistics come with them)
+        predictor_rc = model_registry.get("rate_change")
+        predictor_rph = model_registry.get("rate_per_hour")
+        stats = load_feature_stats()
+
+        # 4. Feature Engineering (lags, rolling stats, etc.) from the streaming
+        # engine: cost depends on the window, not on the history length
+        df_processed = tail_features(df_clean, stats["zscore"]["carbon"])
 
         # We need enough clean rows to calculate features for the very last row (T)
-        rows_needed_for_features = 11
-        df_final_input = df_processed.iloc[-rows_needed_for_features:].dropna().copy()
+        df_final_input = df_processed.iloc[-PREDICTION_CANDIDATE_ROWS:].dropna().copy()
 
         if df_final_input.empty:
             return {"error": "Not enough historical data (need >10 clean rows) to calculate lag/rolling features."}
 
-        # 4. Feature Scaling (REQUIRED)
-        mock_scaler = StandardScaler()
-        cols_to_fit = [col for col in SCALED_NUMERICAL_FEATURES if col in df_processed.columns]
-
-        # Fit scaler on the full processed historical data, then transform the final input block
-        mock_scaler.fit(df_processed[cols_to_fit])
-        df_final_input[cols_to_fit] = mock_scaler.transform(df_final_input[cols_to_fit])
+        # 5. Feature Scaling with the stored (training-time) scaler parameters
+        feature_stats.transform(df_final_input, stats)
 
-        # 5. Prepare Prediction Input (Always the last row)
+        # 6. Prepare Prediction Input (Always the last row) and predict
         prediction_df = df_final_input.iloc[[-1]][PREDICTION_INPUT_COLUMNS]
 
-        # 6. Load Models and Predict
-        predictor_rc = TabularPredictor.load(MODEL_PATH_RATE_CHANGE)
-        predictor_rph = TabularPredictor.load(MODEL_PATH_RATE_PER_HOUR)
-
         prediction_result_rc = predictor_rc.predict(prediction_df)
         prediction_result_rph = predictor_rph.predict(prediction_df)
 
@@ -347,4 +325,184 @@ def get_carbon_prediction(force_refresh: bool = False) -> Dict[str, Any]:
     except Exception as e:
         # Log the full error in a real service
         print(f"Prediction Service Error: {e}")
-        return {"error": f"An unexpected error occurred during prediction: {type(e).__name__}"}
\ No newline at end of file
+        return {"error": f"An unexpected error occurred during prediction: {type(e).__name__}"}
+
+
+# ─────────────────────────────────────────────────────────────
+# PRECOMPUTED PREDICTION (refreshed on ingest)
+# ─────────────────────────────────────────────────────────────
+# ("prediction", "wise4051") -> {"result", "input_timestamp", "computed_at"}
+PREDICTION_KEY = ("prediction", "wise4051")
+
+
+def _store_prediction(result: Dict[str, Any]) -> Optional[Dict]:
+    if "error" in result:
+        return None
+    entry = {
+        "result": result,
+        "input_timestamp": result["timestamp_current"],
+        "computed_at": time.time(),
+    }
+    cache.set(PREDICTION_KEY, entry, ttl=None)
+    return entry
+
+
+def _served(entry: Dict, cached: bool) -> Dict[str, Any]:
+    return {
+        **entry["result"],
+        "prediction_age_seconds": round(time.time() - entry["computed_at"], 3),
+        "cached": cached,
+    }
+
+
+def precompute_prediction(df_raw: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+    result = get_carbon_prediction(df_raw=df_raw)
+    _store_prediction(result)
+    return result
+
+
+def get_precomputed_prediction() -> Optional[Dict[str, Any]]:
+    """
+    Stored result if it was computed from the latest ingested row. No I/O,
+    safe to call on the event loop.
+    """
+    entry = cache.peek(PREDICTION_KEY)
+    if entry is None:
+        return None
+    frame = cache.peek(("frame", WISE4051_ROOT))
+    if frame is not None and not frame.empty:
+        if frame["timestamp"].iloc[-1].isoformat() != entry["input_timestamp"]:
+            return None
+    return _served(entry, cached=True)
+
+
+def get_or_compute_prediction(force_refresh: bool = False) -> Dict[str, Any]:
+    """
+    Precomputed result when current; otherwise compute once (concurrent
+    callers share it) and store it. force_refresh skips the stored result.
+    """
+    if not force_refresh:
+        hit = get_precomputed_prediction()
+        if hit is not None:
+            return hit
+
+    result = singleflight.do(("prediction", force_refresh), get_carbon_prediction)
+    entry = _store_prediction(result)
+    return result if entry is None else _served(entry, cached=False)
+
+
+# ─────────────────────────────────────────────────────────────
+# MULTI-HORIZON FORECAST (recursive, batched across series)
+# ─────────────────────────────────────────────────────────────
+FORECAST_MODEL_STEP_MINUTES = 5   # the models predict the next 5-minute rate change
+FORECAST_MAX_STEPS = 288          # one day of model steps
+
+# Forecast request field -> model input column (latest-reading overrides)
+SENSOR_OVERRIDES = {
+    "co2": "carbon",
+    "temperature": "Temp",
+    "humidity": "Humidity",
+    "light_intensity": "light_intensity",
+    "lux": "lux",
+}
+
+
+def _series_engine(df_clean: pd.DataFrame, sensor: Dict[str, Any]) -> TailFeatureEngine:
+    # A sensor's latest readings replace the last ingested sample
+    overrides = {
+        col: sensor[key] for key, col in SENSOR_OVERRIDES.items()
+        if sensor.get(key) is not None and col in df_clean.columns
+    }
+    if overrides:
+        df_clean = df_clean.copy()
+        for col, value in overrides.items():
+            df_clean.iloc[-1, df_clean.columns.get_loc(col)] = value
+    engine = TailFeatureEngine(keep_rows=1)
+    engine.rebuild(df_clean)
+    return engine
+
+
+def get_carbon_forecast(
+    horizon_minutes: int = 60,
+    step_minutes: int = 5,
+    sensors: Optional[List[Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Forecast curve for the next horizon_minutes. Each step feeds the predicted
+    carbon back as the next sample (lags / rolling features roll forward,
+    other inputs are held at their last value) and scores all series with a
+    single predict() call per predictor.
+
+    The curve always rolls forward in FORECAST_MODEL_STEP_MINUTES steps and
+    reports every step_minutes (a multiple of it); rate_change is then the
+    carbon change since the previous reported point.
+
+    sensors: [{"name", "co2", "temperature", "humidity", "light_intensity", "lux"}]
+    sharing the WISE-4051 history; default is the WISE-4051 series itself.
+    """
+    if step_minutes <= 0 or step_minutes % FORECAST_MODEL_STEP_MINUTES:
+        return {"error": f"step_minutes must be a multiple of {FORECAST_MODEL_STEP_MINUTES}"}
+    stride = step_minutes // FORECAST_MODEL_STEP_MINUTES
+    points = horizon_minutes // step_minutes
+    steps = points * stride
+    if not 1 <= steps <= FORECAST_MAX_STEPS:
+        return {"error": f"horizon/step must give 1..{FORECAST_MAX_STEPS} {FORECAST_MODEL_STEP_MINUTES}-minute steps"}
+
+    try:
+        df_raw = read_ingested(WISE4051_ROOT)
+        if df_raw.empty:
+            return {"error": "No WISE-4051 data has been ingested yet."}
+
+        df_clean = prepare_sensor_frame(
+            df_raw.iloc[-(PREDICTION_CANDIDATE_ROWS + FEATURE_LOOKBACK_ROWS):]
+        )
+        predictor_rc = model_registry.get("rate_change")
+        predictor_rph = model_registry.get("rate_per_hour")
+        stats = load_feature_stats()
+        carbon_stats = stats["zscore"]["carbon"]
+
+        series = sensors or [{"name": "wise4051"}]
+        engines = [_series_engine(df_clean, sensor) for sensor in series]
+        current = [float(engine.last_sample()["carbon"]) for engine in engines]
+        reported = list(current)
+        forecasts: List[List[Dict[str, Any]]] = [[] for _ in series]
+
+        ts = df_clean['timestamp'].iloc[-1]
+        step = pd.Timedelta(minutes=FORECAST_MODEL_STEP_MINUTES)
+        for n in range(1, steps + 1):
+            batch = pd.concat(
+                [engine.frame(carbon_stats, tail=1) for engine in engines], ignore_index=True
+            )
+            batch = feature_stats.transform(batch, stats)[PREDICTION_INPUT_COLUMNS]
+            rate_change = np.asarray(predictor_rc.predict(batch), dtype=np.float64)
+            rate_per_hour = np.asarray(predictor_rph.predict(batch), dtype=np.float64)
+
+            ts = ts + step
+            for i, engine in enumerate(engines):
+                carbon_next = float(engine.last_sample()["carbon"]) + rate_change[i]
+                engine.push(ts, {"carbon": carbon_next})
+                if n % stride == 0:
+                    forecasts[i].append({
+                        "timestamp": ts.isoformat(),
+                        "carbon": carbon_next,
+                        "rate_change": carbon_next - reported[i],
+                        "rate_per_hour": float(rate_per_hour[i]),
+                    })
+                    reported[i] = carbon_next
+
+        return {
+            "timestamp_current": df_clean['timestamp'].iloc[-1].isoformat(),
+            "step_minutes": step_minutes,
+            "horizon_minutes": points * step_minutes,
+            "series": [
+                {"name": sensor.get("name"), "carbon_current": carbon, "forecast": forecast}
+                for sensor, carbon, forecast in zip(series, current, forecasts)
+            ],
+            "message": "Forecast successful."
+        }
+
+    except FileNotFoundError as e:
+        return {"error": f"Model files not found. Ensure models are trained and present: {e}"}
+    except Exception as e:
+        print(f"Forecast Service Error: {e}")
+        return {"error": f"An unexpected error occurred during forecast: {type(e).__name__}"}
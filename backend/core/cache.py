@@ -0,0 +1,137 @@
+# backend/core/cache.py
+#
+# Shared in-process cache for the module-level caches (sensor frames, sensor
+# snapshots, precomputed predictions). Thread-safe, with per-entry TTL, a global
+# byte budget measured via DataFrame.memory_usage(deep=True), LRU eviction
+# and hit / miss / eviction counters. set() swaps a whole entry under the
+# lock, so readers see either the old value or the new one, never a mix.
+#
+# Keys are tuples whose first element is a namespace, e.g. ("frame", root).
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+import pandas as pd
+
+from backend.core.config import settings
+
+_DEFAULT_TTL = object()
+_MISSING = object()
+
+
+def estimate_bytes(value: Any) -> int:
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_bytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_bytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class BoundedCache:
+    def __init__(self, max_bytes: int, default_ttl: Optional[float] = None):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        # key -> {"value", "bytes", "expires"}; order = least recently used first
+        self._entries: "OrderedDict[Hashable, Dict]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    # ── internals (lock held) ───────────────────────────────
+    def _expired(self, entry: Dict, now: float) -> bool:
+        return entry["expires"] is not None and entry["expires"] <= now
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry["bytes"]
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, e in self._entries.items() if self._expired(e, now)]:
+            self._remove(key)
+            self._counters["expirations"] += 1
+
+        # The newest entry is kept even if it alone exceeds the budget
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            self._remove(next(iter(self._entries)))
+            self._counters["evictions"] += 1
+
+    # ── public API ──────────────────────────────────────────
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry, time.monotonic()):
+                self._remove(key)
+                self._counters["expirations"] += 1
+                entry = None
+            if entry is None:
+                self._counters["misses"] += 1
+                return default
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return entry["value"]
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Like get() but does not touch LRU order or counters.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry, time.monotonic()):
+                return default
+            return entry["value"]
+
+    def set(self, key: Hashable, value: Any, ttl: Any = _DEFAULT_TTL) -> None:
+        """
+        Insert or atomically replace an entry. ttl=None never expires;
+        the default is the cache's default_ttl.
+        """
+        size = estimate_bytes(value)  # outside the lock; deep sizing is O(rows)
+        ttl = self.default_ttl if ttl is _DEFAULT_TTL else ttl
+        expires = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = {"value": value, "bytes": size, "expires": expires}
+            self._bytes += size
+            self._evict()
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._entries:
+                return default
+            value = self._entries[key]["value"]
+            self._remove(key)
+            return value
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            for key in [k for k in self._entries if isinstance(k, tuple) and k[:1] == (namespace,)]:
+                self._remove(key)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.peek(key, _MISSING) is not _MISSING
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+# Process-wide instance shared by every module-level cache
+cache = BoundedCache(settings.CACHE_MAX_BYTES, settings.CACHE_TTL_SECONDS)
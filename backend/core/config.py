@@ -17,4 +17,52 @@ class Settings:
 
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+    # Shared in-process cache. Ingested frames and sensor snapshots never
+    # expire (only the byte budget evicts them); the TTL applies to the rest.
+    CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+    CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", "900"))
+
+    # Ingest scheduler (one job per device)
+    INGEST_INTERVAL_SECONDS = float(os.getenv("INGEST_INTERVAL_SECONDS", "60"))
+    INGEST_JITTER = float(os.getenv("INGEST_JITTER", "0.1"))
+    INGEST_MAX_BACKOFF_SECONDS = float(os.getenv("INGEST_MAX_BACKOFF_SECONDS", "900"))
+
+    # How often model directories are checked for a new version.txt
+    MODEL_RELOAD_CHECK_SECONDS = float(os.getenv("MODEL_RELOAD_CHECK_SECONDS", "30"))
+
+    # Inference mode: "ensemble" (full AutoGluon predictor), "single" (one of
+    # its models, MODEL_INFERENCE_MODEL or the best non-ensemble one) or
+    # "lite" (LightGBM export from scripts/export_lite_model.py, no AutoGluon)
+    MODEL_INFERENCE_MODE = os.getenv("MODEL_INFERENCE_MODE", "ensemble")
+    MODEL_INFERENCE_MODEL = os.getenv("MODEL_INFERENCE_MODEL", "")
+
+    # Execution tiers (core/executor.py): threads for I/O-bound route work and
+    # model scoring, processes for CPU-bound pandas work (0 = run it on
+    # CPU_THREAD_WORKERS threads instead). Windows of at least
+    # CPU_OFFLOAD_MIN_ROWS rows, or downsampled ones, go to the cpu tier.
+    IO_POOL_WORKERS = int(os.getenv("IO_POOL_WORKERS", "8"))
+    CPU_POOL_WORKERS = int(os.getenv("CPU_POOL_WORKERS", "2"))
+    CPU_POOL_START_METHOD = os.getenv("CPU_POOL_START_METHOD", "spawn")
+    CPU_THREAD_WORKERS = int(os.getenv("CPU_THREAD_WORKERS", "4"))
+    CPU_OFFLOAD_MIN_ROWS = int(os.getenv("CPU_OFFLOAD_MIN_ROWS", "5000"))
+    SHARED_FRAME_DIR = os.getenv("SHARED_FRAME_DIR", "")
+
+    # Ollama chat (core/ollama_service.py); the read timeout applies per
+    # streamed chunk, not to the whole generation
+    OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://127.0.0.1:8001")
+    OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3")
+    OLLAMA_CONNECT_TIMEOUT = float(os.getenv("OLLAMA_CONNECT_TIMEOUT", "5"))
+    OLLAMA_READ_TIMEOUT = float(os.getenv("OLLAMA_READ_TIMEOUT", "120"))
+    OLLAMA_MAX_CONNECTIONS = int(os.getenv("OLLAMA_MAX_CONNECTIONS", "4"))
+
+    # Ollama admission control: generations run at once, requests allowed to
+    # wait (beyond that -> 429), default / max seconds a request may wait
+    # (then 503), how long Ollama keeps the model loaded, warmup at startup
+    OLLAMA_MAX_CONCURRENCY = int(os.getenv("OLLAMA_MAX_CONCURRENCY", "1"))
+    OLLAMA_QUEUE_SIZE = int(os.getenv("OLLAMA_QUEUE_SIZE", "8"))
+    OLLAMA_QUEUE_TIMEOUT_SECONDS = float(os.getenv("OLLAMA_QUEUE_TIMEOUT_SECONDS", "30"))
+    OLLAMA_MAX_DEADLINE_SECONDS = float(os.getenv("OLLAMA_MAX_DEADLINE_SECONDS", "120"))
+    OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+    OLLAMA_WARMUP = os.getenv("OLLAMA_WARMUP", "true").lower() in ("1", "true", "yes")
+
 settings = Settings()
\ No newline at end of file
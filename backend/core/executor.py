@@ -0,0 +1,190 @@
+# backend/core/executor.py
+#
+# Execution tiers for blocking route work, so one heavy request can't stall
+# the others:
+#
+#   io   thread pool   Dropbox / local store reads, cache lookups, small
+#                      slices (mostly waiting, or too cheap to ship), and
+#                      forecasts, which score with the server's warm models
+#   cpu  process pool  resampling, downsampling, encoding large windows
+#                      (pandas holds the GIL)
+#
+# Frames go to cpu workers as Arrow IPC files on shared memory (/dev/shm):
+# ship(df) writes a frame once and returns a small handle, workers memory-map
+# it instead of receiving a pickled copy. The file is removed when the
+# server's frame object is garbage collected, so a cached frame is written
+# once per data version however many requests read it.
+#
+# CPU_POOL_WORKERS=0 runs the cpu tier on threads (no extra processes, e.g.
+# on a small edge box); ship() then passes frames through unchanged.
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import uuid
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, NamedTuple, Optional, Union
+
+import pandas as pd
+
+from backend.core.config import settings
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+_pools: Dict[str, Executor] = {}
+_pools_lock = threading.Lock()
+_counters = {"io": 0, "cpu": 0, "shipped": 0, "shipped_bytes": 0}
+
+
+class SharedFrame(NamedTuple):
+    path: str
+    rows: int
+
+
+# ─────────────────────────────────────────────────────────────
+# Pools
+# ─────────────────────────────────────────────────────────────
+def uses_processes() -> bool:
+    return settings.CPU_POOL_WORKERS > 0 and pa is not None
+
+
+def _pool(tier: str) -> Executor:
+    pool = _pools.get(tier)
+    if pool is not None:
+        return pool
+    with _pools_lock:
+        pool = _pools.get(tier)
+        if pool is None:
+            if tier == "io":
+                pool = ThreadPoolExecutor(settings.IO_POOL_WORKERS, thread_name_prefix="io")
+            elif uses_processes():
+                pool = ProcessPoolExecutor(
+                    settings.CPU_POOL_WORKERS,
+                    mp_context=multiprocessing.get_context(settings.CPU_POOL_START_METHOD),
+                )
+            else:
+                pool = ThreadPoolExecutor(settings.CPU_THREAD_WORKERS, thread_name_prefix="cpu")
+            _pools[tier] = pool
+    return pool
+
+
+async def run_io(fn: Callable, *args, **kwargs) -> Any:
+    _counters["io"] += 1
+    return await asyncio.get_running_loop().run_in_executor(_pool("io"), partial(fn, *args, **kwargs))
+
+
+async def run_cpu(fn: Callable, *args, **kwargs) -> Any:
+    """
+    fn and its arguments must be picklable (module-level function; frames
+    passed through ship()).
+    """
+    _counters["cpu"] += 1
+    return await asyncio.get_running_loop().run_in_executor(_pool("cpu"), partial(fn, *args, **kwargs))
+
+
+def shutdown() -> None:
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        _pools.clear()
+    for key, (_, handle) in list(_shipped.items()):
+        _remove(key, handle.path)
+
+
+def status() -> Dict[str, Any]:
+    return {
+        **_counters,
+        "io_workers": settings.IO_POOL_WORKERS,
+        "cpu_workers": settings.CPU_POOL_WORKERS if uses_processes() else 0,
+        "cpu_threads": 0 if uses_processes() else settings.CPU_THREAD_WORKERS,
+        "shared_frames": len(_shipped),
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# Shared frames (server side)
+# ─────────────────────────────────────────────────────────────
+# id(frame) -> (weakref to the frame, handle)
+_shipped: Dict[int, tuple] = {}
+_shipped_lock = threading.Lock()
+
+
+def _shared_dir() -> str:
+    path = settings.SHARED_FRAME_DIR
+    if not path:
+        path = "/dev/shm" if os.path.isdir("/dev/shm") else os.path.join(os.getcwd(), ".shared_frames")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _remove(key: int, path: str) -> None:
+    with _shipped_lock:
+        entry = _shipped.get(key)
+        if entry is not None and entry[1].path == path:
+            del _shipped[key]
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def ship(df: pd.DataFrame) -> Union[pd.DataFrame, SharedFrame]:
+    """
+    What to pass to a cpu-tier function instead of df. The server must keep
+    df referenced until the call returns (the file lives as long as df).
+    """
+    if not uses_processes():
+        return df
+
+    key = id(df)
+    with _shipped_lock:
+        entry = _shipped.get(key)
+        if entry is not None and entry[0]() is df:
+            return entry[1]
+
+    path = os.path.join(_shared_dir(), f"frame-{os.getpid()}-{uuid.uuid4().hex}.arrow")
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    handle = SharedFrame(path, len(df))
+    with _shipped_lock:
+        _shipped[key] = (weakref.ref(df, lambda _, key=key, path=path: _remove(key, path)), handle)
+    _counters["shipped"] += 1
+    _counters["shipped_bytes"] += os.path.getsize(path)
+    return handle
+
+
+# ─────────────────────────────────────────────────────────────
+# Shared frames (worker side)
+# ─────────────────────────────────────────────────────────────
+_WORKER_FRAMES = 4
+_attached: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+
+
+def frame(source: Union[pd.DataFrame, SharedFrame]) -> pd.DataFrame:
+    """
+    The DataFrame behind a ship() result; memory-mapped files are read once
+    per worker and kept for the next jobs on the same frame.
+    """
+    if isinstance(source, pd.DataFrame):
+        return source
+
+    df = _attached.get(source.path)
+    if df is not None:
+        _attached.move_to_end(source.path)
+        return df
+
+    with pa.memory_map(source.path, "r") as mapped:
+        df = pa.ipc.open_file(mapped).read_all().to_pandas()
+    _attached[source.path] = df
+    while len(_attached) > _WORKER_FRAMES:
+        _attached.popitem(last=False)
+    return df
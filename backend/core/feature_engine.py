@@ -0,0 +1,269 @@
+# backend/core/feature_engine.py
+#
+# Streaming version of predict.create_advanced_features. Keeps a ring buffer
+# of the last keep_rows + LOOKBACK_ROWS sensor samples and computes each new row's
+# features (diff, lags 1-5, shifted rolling mean/std/min/max over 3/5/10,
+# interactions, calendar features) from that buffer only, so a push costs
+# O(window) no matter how long the history is. The last keep_rows feature
+# rows are kept for the prediction input.
+#
+# Values and dtypes match the batch path (same NumPy dtype promotion; rolling
+# stats agree to floating-point rounding). carbon_zscore depends on the
+# model's stored stats and is applied when the frame is read.
+
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+CARBON_LAGS = 5
+ROLLING_WINDOWS = (3, 5, 10)
+LOOKBACK_ROWS = max(max(ROLLING_WINDOWS), CARBON_LAGS)
+
+INPUT_COLUMNS = ("carbon", "Temp", "Humidity", "light_intensity", "lux")
+
+TIME_OF_DAY_BINS = [0, 6, 12, 18, 24]
+TIME_OF_DAY_LABELS = ["night", "morning", "afternoon", "evening"]
+LIGHT_BINS = [0, 100, 500, 1000, float("inf")]
+LIGHT_LABELS = ["dark", "low", "medium", "bright"]
+
+
+def _bin(value, bins, labels) -> Optional[str]:
+    # pd.cut(..., right=False, include_lowest=True) for one value
+    if pd.isna(value):
+        return None
+    for lo, hi, label in zip(bins[:-1], bins[1:], labels):
+        if lo <= value < hi:
+            return label
+    return None
+
+
+class TailFeatureEngine:
+    def __init__(self, keep_rows: int = LOOKBACK_ROWS + 1):
+        self.keep_rows = keep_rows
+        # Every sample the kept rows depend on, so matches() can compare all of them
+        self._samples: deque = deque(maxlen=keep_rows + LOOKBACK_ROWS)
+        self._rows: deque = deque(maxlen=keep_rows)
+        self._dtypes: Dict[str, np.dtype] = {}
+        self._lock = threading.RLock()
+
+    # ── state ───────────────────────────────────────────────
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._rows.clear()
+            self._dtypes = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def last_sample(self) -> Optional[Dict]:
+        return self._samples[-1] if self._samples else None
+
+    def matches(self, df: pd.DataFrame) -> bool:
+        """
+        True if the buffered samples equal df's tail (timestamps, every input
+        column and dtype), so edited / backfilled rows force a rebuild.
+        """
+        with self._lock:
+            if df.empty or not self._samples:
+                return False
+            n = min(len(df), self._samples.maxlen)
+            if len(self._samples) != n:
+                return False
+            samples = list(self._samples)
+            tail = df.iloc[-n:]
+            if tail["timestamp"].tolist() != [sample["ts"] for sample in samples]:
+                return False
+            for c, dtype in self._dtypes.items():
+                if c == "timestamp":
+                    continue
+                if c not in tail.columns or tail[c].dtype != dtype:
+                    return False
+                ours = np.array([sample[c] for sample in samples], dtype=dtype)
+                theirs = tail[c].to_numpy()
+                same = (ours == theirs) | (pd.isna(ours) & pd.isna(theirs))
+                if not same.all():
+                    return False
+            return True
+
+    # ── ingest ──────────────────────────────────────────────
+    def extend(self, df: pd.DataFrame) -> bool:
+        """
+        Push rows (timestamp + INPUT_COLUMNS, sorted by timestamp).
+        Returns False, without changing state, if they don't continue the buffer
+        (out-of-order / late rows); the caller should rebuild().
+        """
+        if df.empty:
+            return True
+        with self._lock:
+            last = self.last_sample()
+            if last is not None and df["timestamp"].iloc[0] <= last["ts"]:
+                return False
+            if not self._dtypes:
+                self._dtypes = {c: df[c].dtype for c in ("timestamp",) + INPUT_COLUMNS if c in df.columns}
+
+            timestamps = df["timestamp"].tolist()
+            columns = {c: df[c].to_numpy() for c in INPUT_COLUMNS if c in self._dtypes}
+            for i, ts in enumerate(timestamps):
+                sample = {"ts": ts}
+                for c, values in columns.items():
+                    sample[c] = values[i]
+                self._rows.append(self._compute(sample))
+                self._samples.append(sample)
+        return True
+
+    def push(self, ts: pd.Timestamp, values: Dict[str, float]) -> None:
+        """
+        Append one sample after the buffer (e.g. a forecast step); values are
+        cast to the buffer's input dtypes, missing inputs repeat the last sample.
+        """
+        with self._lock:
+            last = self.last_sample()
+            if last is None or ts <= last["ts"]:
+                raise ValueError("push() needs a non-empty buffer and a later timestamp")
+            sample = {"ts": ts}
+            for c in INPUT_COLUMNS:
+                if c in self._dtypes:
+                    sample[c] = self._dtypes[c].type(values[c]) if c in values else last[c]
+            self._rows.append(self._compute(sample))
+            self._samples.append(sample)
+
+    def rebuild(self, df: pd.DataFrame) -> None:
+        with self._lock:
+            self.reset()
+            self.extend(df.iloc[-(self.keep_rows + LOOKBACK_ROWS):])
+
+    def sync(self, df: pd.DataFrame, carbon_stats: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+        """
+        Feature rows for df's tail: match -> rebuild if needed -> frame, as
+        one step under the lock, so a concurrent ingest extend() / reset()
+        can't leave the caller with an empty or different buffer.
+        """
+        with self._lock:
+            if not self.matches(df):
+                self.rebuild(df)
+            return self.frame(carbon_stats)
+
+    def _compute(self, sample: Dict) -> Dict:
+        prev = list(self._samples)
+        carbon_type = self._dtypes["carbon"].type
+        nan_c = carbon_type(np.nan)
+        c = sample["carbon"]
+        past = [p["carbon"] for p in prev]
+        ts = sample["ts"]
+
+        row = {"TIM": ts}
+        for col in INPUT_COLUMNS:
+            if col in sample:
+                row[col] = sample[col]
+
+        if prev:
+            rate_change = c - past[-1]
+            hours = (ts - prev[-1]["ts"]).total_seconds() / 3600
+        else:
+            rate_change, hours = nan_c, np.nan
+        row["instantaneous_rate_change"] = rate_change
+        row["time_diff_hours"] = 0.0 if pd.isna(hours) else hours
+        row["instantaneous_rate_per_hour"] = (
+            np.float64(rate_change) / hours if not pd.isna(hours) and hours != 0 else np.nan
+        )
+
+        if "light_intensity" in sample:
+            row["light intensity"] = sample["light_intensity"]
+
+        hour, day_of_week = ts.hour, ts.dayofweek
+        row["hour"] = hour
+        row["day_of_week"] = day_of_week
+        row["minute"] = ts.minute
+        row["is_weekend"] = int(day_of_week >= 5)
+        row["time_of_day"] = _bin(hour, TIME_OF_DAY_BINS, TIME_OF_DAY_LABELS)
+
+        lags = [past[-k] if len(past) >= k else nan_c for k in range(1, CARBON_LAGS + 1)]
+        for k, lag in enumerate(lags, start=1):
+            row[f"carbon_lag{k}"] = lag
+
+        for window in ROLLING_WINDOWS:
+            values = np.asarray(past[-window:], dtype=np.float64)
+            if len(values) < window or np.isnan(values).any():
+                stats = (np.nan, np.nan, np.nan, np.nan)
+            else:
+                stats = (values.mean(), values.std(ddof=1), values.min(), values.max())
+            for name, value in zip(("mean", "std", "min", "max"), stats):
+                row[f"carbon_rolling_{name}_{window}"] = value
+
+        row["carbon_lag1_diff"] = lags[0] - lags[1]
+        row["carbon_lag2_diff"] = lags[1] - lags[2]
+
+        if "Temp" in sample and "Humidity" in sample:
+            row["temp_humidity_interaction"] = sample["Temp"] * sample["Humidity"]
+            row["comfort_index"] = 0.5 * (sample["Temp"] + sample["Humidity"])
+
+        if "light_intensity" in sample:
+            row["light_category"] = _bin(sample["light_intensity"], LIGHT_BINS, LIGHT_LABELS)
+
+        row["hour_sin"] = np.sin(2 * np.pi * hour / 24)
+        row["hour_cos"] = np.cos(2 * np.pi * hour / 24)
+        row["day_sin"] = np.sin(2 * np.pi * day_of_week / 7)
+        row["day_cos"] = np.cos(2 * np.pi * day_of_week / 7)
+        return row
+
+    # ── read ────────────────────────────────────────────────
+    def _column_dtypes(self) -> Dict[str, object]:
+        d = self._dtypes
+        carbon = d["carbon"]
+        dtypes = {"TIM": d["timestamp"]}
+        dtypes.update({c: d[c] for c in INPUT_COLUMNS if c in d})
+        dtypes.update({
+            "instantaneous_rate_change": carbon,
+            "time_diff_hours": np.float64,
+            "instantaneous_rate_per_hour": np.float64,
+            "hour": np.int32,
+            "day_of_week": np.int32,
+            "minute": np.int32,
+            "is_weekend": np.int64,
+            "carbon_lag1_diff": carbon,
+            "carbon_lag2_diff": carbon,
+        })
+        if "light_intensity" in d:
+            dtypes["light intensity"] = d["light_intensity"]
+        for k in range(1, CARBON_LAGS + 1):
+            dtypes[f"carbon_lag{k}"] = carbon
+        if "Temp" in d and "Humidity" in d:
+            pair = np.result_type(d["Temp"], d["Humidity"])
+            dtypes["temp_humidity_interaction"] = pair
+            dtypes["comfort_index"] = pair
+        return dtypes
+
+    def frame(self, carbon_stats: Optional[Dict[str, float]] = None, tail: Optional[int] = None) -> pd.DataFrame:
+        """
+        The kept feature rows (oldest first; only the last `tail` if given),
+        columns/dtypes as the batch path.
+        carbon_stats: {"mean", "std"} for carbon_zscore (omitted if None).
+        """
+        with self._lock:
+            rows: List[Dict] = list(self._rows)
+            if tail is not None:
+                rows = rows[-tail:]
+            if not rows:
+                return pd.DataFrame()
+            dtypes = self._column_dtypes()
+
+        out = {}
+        for col in rows[0]:
+            values = [r[col] for r in rows]
+            if col == "time_of_day":
+                out[col] = pd.Categorical(values, categories=TIME_OF_DAY_LABELS, ordered=True)
+            elif col == "light_category":
+                out[col] = pd.Categorical(values, categories=LIGHT_LABELS, ordered=True)
+            elif col in dtypes:
+                out[col] = np.array(values, dtype=dtypes[col])
+            else:
+                out[col] = np.array(values, dtype=np.float64)
+
+        df = pd.DataFrame(out)
+        if carbon_stats is not None:
+            df["carbon_zscore"] = (df["carbon"] - carbon_stats["mean"]) / carbon_stats["std"]
+        return df
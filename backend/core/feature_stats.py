@@ -0,0 +1,125 @@
+# backend/core/feature_stats.py
+#
+# Training-time feature statistics stored next to each AutoGluon model as
+# feature_stats.json: StandardScaler parameters (mean / scale per scaled
+# feature) and the carbon mean / std used for carbon_zscore. Inference
+# applies them to the last rows only instead of refitting on the cached
+# history, so predictions no longer drift with the cache window.
+#
+# The file is fitted offline on the training data (scripts/fit_feature_stats.py)
+# and records the model's version.txt; load() rejects it once the model has
+# been retrained, so a new model is never scored with its predecessor's stats.
+
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+FEATURE_STATS_FILE = "feature_stats.json"
+VERSION_FILE = "version.txt"
+FORMAT_VERSION = 2
+
+
+def fit(
+    df_features: pd.DataFrame,
+    scaled_columns: List[str],
+    source: str = "training",
+    model_version: Optional[str] = None,
+) -> Dict:
+    """
+    Statistics equivalent to StandardScaler().fit(df_features[cols]) plus the
+    carbon mean / std (pandas, ddof=1) that carbon_zscore uses.
+    df_features must already contain carbon_zscore built from the same carbon stats.
+    model_version: version.txt of the model the statistics were trained with.
+    """
+    cols = [c for c in scaled_columns if c in df_features.columns]
+    values = df_features[cols].astype("float64")
+    mean = values.mean()
+    scale = values.std(ddof=0)
+    scale = scale.where(scale > np.finfo(np.float64).eps * 10, 1.0)  # constant columns, as sklearn
+
+    return {
+        "format_version": FORMAT_VERSION,
+        "source": source,
+        "model_version": model_version,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "rows": int(len(df_features)),
+        "scaler": {
+            "columns": cols,
+            "mean": [float(mean[c]) for c in cols],
+            "scale": [float(scale[c]) for c in cols],
+        },
+        "zscore": {"carbon": carbon_stats(df_features["carbon"])},
+    }
+
+
+def carbon_stats(carbon: pd.Series) -> Dict[str, float]:
+    return {"mean": float(carbon.mean()), "std": float(carbon.std())}
+
+
+def transform(df: pd.DataFrame, stats: Dict) -> pd.DataFrame:
+    """
+    Scale the stored columns in place (same result as scaler.transform).
+    """
+    scaler = stats["scaler"]
+    cols = [c for c in scaler["columns"] if c in df.columns]
+    params = dict(zip(scaler["columns"], zip(scaler["mean"], scaler["scale"])))
+    for col in cols:
+        mean, scale = params[col]
+        df[col] = (df[col].astype("float64") - mean) / scale
+    return df
+
+
+def path_for(model_dir: str) -> str:
+    return os.path.join(model_dir, FEATURE_STATS_FILE)
+
+
+def model_version(model_dir: str) -> Optional[str]:
+    try:
+        with open(os.path.join(model_dir, VERSION_FILE), "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def load(model_dir: str) -> Optional[Dict]:
+    """
+    The directory's feature_stats.json, or None if it is missing, unreadable
+    or was fitted for another version of the model.
+    """
+    try:
+        with open(path_for(model_dir), "r", encoding="utf-8") as f:
+            stats = json.load(f)
+    except FileNotFoundError:
+        return None
+    except json.JSONDecodeError as e:
+        print(f"⚠️ Unreadable {path_for(model_dir)}: {e}")
+        return None
+
+    if stats.get("format_version") != FORMAT_VERSION:
+        print(f"⚠️ Ignoring {path_for(model_dir)}: format_version {stats.get('format_version')}")
+        return None
+    version = model_version(model_dir)
+    if stats.get("model_version") != version:
+        print(f"⚠️ Ignoring {path_for(model_dir)}: fitted for model version "
+              f"{stats.get('model_version')!r}, model is {version!r}")
+        return None
+    return stats
+
+
+def save(stats: Dict, model_dir: str) -> None:
+    path = path_for(model_dir)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(stats, f, indent=1)
+    os.replace(tmp, path)
+
+
+def mtime(model_dir: str) -> Optional[int]:
+    try:
+        return os.stat(path_for(model_dir)).st_mtime_ns
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,154 @@
+# backend/core/lite_model.py
+#
+# Inference-only export of one model out of an AutoGluon predictor, for edge
+# deployments that don't want the ensemble or the AutoGluon import tree.
+# An export directory holds:
+#   lite.json           format, source model, input features, categories
+#   model.txt           LightGBM booster (native text format)
+#   feature_stats.json  copied from the predictor directory
+#   version.txt         the predictor's version, written last so the registry's
+#                       fingerprint changes once the export is complete
+#
+# Loading needs lightgbm + pandas only. Only LightGBM models are exportable:
+# they take AutoGluon's generated features as-is (native NaN / categorical
+# handling), so no model-specific preprocessing has to be reimplemented.
+
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from backend.core import feature_stats
+
+try:
+    import lightgbm
+except ImportError:
+    lightgbm = None
+
+LITE_FILE = "lite.json"
+LITE_SUBDIR = "lite"
+FORMAT_VERSION = 1
+EXPORTABLE_MODEL_TYPES = ("LGBModel",)
+
+
+def is_lite_dir(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, LITE_FILE))
+
+
+def lite_dir_for(model_dir: str) -> str:
+    """
+    The export to load for a registered model path: the path itself if it is
+    an export, else its lite/ subdirectory.
+    """
+    return model_dir if is_lite_dir(model_dir) else os.path.join(model_dir, LITE_SUBDIR)
+
+
+class LiteModel:
+    def __init__(self, path: str):
+        if lightgbm is None:
+            raise ImportError("lightgbm is required to load lite models")
+        with open(os.path.join(path, LITE_FILE), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported lite format_version {meta.get('format_version')}")
+
+        self.path = path
+        self.meta = meta
+        self.features: List[str] = meta["features"]
+        self.categories: Dict[str, List] = meta.get("categories", {})
+        self.booster = lightgbm.Booster(model_file=os.path.join(path, meta["model_file"]))
+
+        # Categories -> the booster's own codes, so predict() gets a plain
+        # float matrix and skips LightGBM's per-call pandas conversion
+        categorical = [c for c in self.features if c in self.categories]
+        trained = self.booster.pandas_categorical or [self.categories[c] for c in categorical]
+        self._codes = {
+            col: {value: float(code) for code, value in enumerate(values)}
+            for col, values in zip(categorical, trained)
+        }
+        self._numeric = [i for i, c in enumerate(self.features) if c not in self._codes]
+
+    def _input(self, df: pd.DataFrame) -> np.ndarray:
+        X = np.empty((len(df), len(self.features)), dtype=np.float64)
+        numeric = [self.features[i] for i in self._numeric]
+        X[:, self._numeric] = df[numeric].to_numpy(dtype=np.float64, na_value=np.nan)
+        for i, col in enumerate(self.features):
+            codes = self._codes.get(col)
+            if codes is not None:
+                X[:, i] = [codes.get(value, np.nan) for value in df[col].tolist()]
+        return X
+
+    def predict(self, df: pd.DataFrame) -> pd.Series:
+        values = self.booster.predict(self._input(df))
+        return pd.Series(values, index=df.index, name=self.meta.get("label"))
+
+
+def load(path: str) -> LiteModel:
+    return LiteModel(path)
+
+
+# ── export (needs AutoGluon; run from scripts/export_lite_model.py) ──
+def export(predictor, model_name: Optional[str], source_dir: str, out_dir: str,
+           sample: pd.DataFrame, tolerance: float = 1e-6) -> Dict:
+    """
+    Export model_name (default: the best non-ensemble LightGBM model) from
+    predictor to out_dir, then check that the export reproduces
+    predictor.predict(sample, model=model_name) within tolerance.
+    """
+    trainer = predictor._trainer
+    if model_name is None:
+        board = predictor.leaderboard(silent=True)
+        candidates = [
+            m for m in board["model"]
+            if type(trainer.load_model(m)).__name__ in EXPORTABLE_MODEL_TYPES
+        ]
+        if not candidates:
+            raise ValueError("predictor has no exportable (LightGBM) model")
+        model_name = candidates[0]  # leaderboard is sorted best first
+
+    model = trainer.load_model(model_name)
+    if type(model).__name__ not in EXPORTABLE_MODEL_TYPES:
+        raise ValueError(f"{model_name} is a {type(model).__name__}; only LightGBM models can be exported")
+
+    features = predictor.transform_features(sample, model=model_name)
+    categories = {
+        col: features[col].cat.categories.tolist()
+        for col in features.columns if isinstance(features[col].dtype, pd.CategoricalDtype)
+    }
+
+    os.makedirs(out_dir, exist_ok=True)
+    model.model.save_model(os.path.join(out_dir, "model.txt"))
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "format": "lightgbm",
+        "model_file": "model.txt",
+        "source_model": model_name,
+        "source_dir": os.path.abspath(source_dir),
+        "label": predictor.label,
+        "features": list(features.columns),
+        "categories": categories,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    with open(os.path.join(out_dir, LITE_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=1)
+
+    # The export serves the source's version; its stats are tied to that
+    version = feature_stats.model_version(source_dir) or meta["created_at"]
+    stats = feature_stats.load(source_dir)
+    if stats is not None:
+        feature_stats.save(stats | {"model_version": version}, out_dir)
+
+    expected = np.asarray(predictor.predict(sample, model=model_name), dtype=np.float64)
+    actual = np.asarray(LiteModel(out_dir).predict(sample), dtype=np.float64)
+    max_diff = float(np.max(np.abs(expected - actual))) if len(sample) else 0.0
+    if max_diff > tolerance:
+        raise ValueError(f"export of {model_name} differs from AutoGluon by {max_diff:g}")
+
+    with open(os.path.join(out_dir, feature_stats.VERSION_FILE), "w", encoding="utf-8") as f:
+        f.write(version)
+
+    print(f"📦 Exported {model_name} to {out_dir} (max diff {max_diff:g})")
+    return meta | {"max_diff": max_diff}
@@ -0,0 +1,203 @@
+# backend/core/model_registry.py
+#
+# Warm AutoGluon predictors. Each registered model directory is loaded once,
+# persisted in memory (predictor.persist()), and kept until its fingerprint
+# (version.txt contents + mtimes of version.txt / predictor.pkl) changes, at
+# which point the new predictor is loaded next to the old one and swapped in.
+# The old one is not unpersisted: requests that fetched it before the swap may
+# still be predicting, so it is freed when the last of them drops it.
+# Requests never pay TabularPredictor.load. The model's feature_stats.json
+# (see feature_stats.py) is loaded with it, only if it was fitted for that
+# model version, and re-read when it changes.
+#
+# settings.MODEL_INFERENCE_MODE picks what is served: the full ensemble, a
+# single model of the predictor, or a lite export (lite_model.py). AutoGluon
+# is only imported in the first two modes.
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from backend.core import feature_stats, lite_model, singleflight
+from backend.core.config import settings
+
+INFERENCE_MODES = ("ensemble", "single", "lite")
+
+# name -> {"path", "predictor", "fingerprint", "version", "loaded_at",
+#          "load_seconds", "memory_bytes", "persisted", "mode", "model",
+#          "feature_stats", "feature_stats_mtime"}
+_models: Dict[str, Dict] = {}
+_lock = threading.Lock()
+
+
+def register(name: str, path: str) -> None:
+    with _lock:
+        entry = _models.get(name)
+        if entry is None or entry["path"] != path:
+            _models[name] = {"path": path, "predictor": None, "fingerprint": None, "feature_stats": None}
+
+
+def model_dir(name: str) -> str:
+    """
+    Directory the served model (and its feature_stats.json) is loaded from.
+    """
+    path = _models[name]["path"]
+    return lite_model.lite_dir_for(path) if settings.MODEL_INFERENCE_MODE == "lite" else path
+
+
+def _fingerprint(path: str) -> Optional[str]:
+    version_file = os.path.join(path, "version.txt")
+    try:
+        with open(version_file, "r", encoding="utf-8") as f:
+            version = f.read().strip()
+        parts = [version, str(os.stat(version_file).st_mtime_ns)]
+    except FileNotFoundError:
+        return None
+    try:
+        parts.append(str(os.stat(os.path.join(path, "predictor.pkl")).st_mtime_ns))
+    except FileNotFoundError:
+        pass
+    return ":".join(parts)
+
+
+def _rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class SingleModel:
+    """
+    One model of a TabularPredictor, served through the same predict(df) call.
+    """
+
+    def __init__(self, predictor, model: str):
+        self.predictor = predictor
+        self.model = model
+
+    def predict(self, df):
+        return self.predictor.predict(df, model=self.model)
+
+
+def best_single_model(predictor) -> str:
+    board = predictor.leaderboard(silent=True)  # best first
+    for model in board["model"]:
+        if not model.startswith("WeightedEnsemble"):
+            return model
+    raise ValueError("predictor has no non-ensemble model")
+
+
+def load_predictor(path: str, mode: str, model: Optional[str] = None):
+    """
+    Returns (predictor-like object with predict(df), served model name, persisted models).
+    model: the model to serve in "single" mode (default: best non-ensemble).
+    """
+    if mode == "lite":
+        model = lite_model.load(path)
+        return model, model.meta["source_model"], []
+
+    from autogluon.tabular import TabularPredictor
+
+    predictor = TabularPredictor.load(path)
+    persist = getattr(predictor, "persist", None) or getattr(predictor, "persist_models")
+    if mode == "single":
+        model = model or best_single_model(predictor)
+        return SingleModel(predictor, model), model, persist(models=[model])
+    return predictor, "ensemble", persist()
+
+
+def _load(name: str) -> Dict:
+    entry = _models[name]
+    path = entry["path"]
+    mode = settings.MODEL_INFERENCE_MODE
+    if mode not in INFERENCE_MODES:
+        raise ValueError(f"MODEL_INFERENCE_MODE must be one of {INFERENCE_MODES}, got {mode!r}")
+    source = model_dir(name)
+    fingerprint = _fingerprint(source)
+
+    rss_before = _rss_bytes()
+    started = time.perf_counter()
+
+    predictor, served, persisted = load_predictor(source, mode, settings.MODEL_INFERENCE_MODEL or None)
+
+    load_seconds = time.perf_counter() - started
+    rss_after = _rss_bytes()
+
+    with _lock:
+        _models[name] = {
+            "path": path,
+            "predictor": predictor,
+            "fingerprint": fingerprint,
+            "version": fingerprint.split(":", 1)[0] if fingerprint else None,
+            "loaded_at": time.time(),
+            "load_seconds": load_seconds,
+            "memory_bytes": rss_after - rss_before if rss_before is not None and rss_after is not None else None,
+            "persisted": list(persisted or []),
+            "mode": mode,
+            "model": served,
+            "feature_stats": feature_stats.load(source),
+            "feature_stats_mtime": feature_stats.mtime(source),
+        }
+
+    print(f"🧠 Loaded model {name} ({mode}: {served}) from {source} in {load_seconds:.1f}s")
+    return _models[name]
+
+
+def get(name: str) -> Any:
+    """
+    Warm predictor for name; the first call (if startup hasn't loaded it yet)
+    loads it, concurrent first callers share that load.
+    """
+    predictor = _models[name]["predictor"]
+    if predictor is not None:
+        return predictor
+
+    def load():
+        current = _models[name]["predictor"]
+        return current if current is not None else _load(name)["predictor"]
+
+    return singleflight.do(("model", name), load)
+
+
+def get_feature_stats(name: str) -> Optional[Dict]:
+    return _models[name].get("feature_stats")
+
+
+def reload_feature_stats(name: str) -> None:
+    entry = _models[name]
+    source = model_dir(name)
+    stats, mtime = feature_stats.load(source), feature_stats.mtime(source)
+    with _lock:
+        entry["feature_stats"] = stats
+        entry["feature_stats_mtime"] = mtime
+
+
+def reload_if_changed() -> None:
+    """
+    Load models that aren't loaded yet and hot-swap those whose version changed.
+    Runs as a scheduler job; a failed reload keeps serving the old predictor.
+    """
+    for name in list(_models):
+        entry = _models[name]
+        source = model_dir(name)
+        if entry["predictor"] is not None and _fingerprint(source) == entry["fingerprint"]:
+            if feature_stats.mtime(source) != entry.get("feature_stats_mtime"):
+                reload_feature_stats(name)
+            continue
+        try:
+            singleflight.do(("model", name), lambda: _load(name)["predictor"])
+        except Exception as e:
+            print(f"⚠️ Failed to load model {name}: {e}")
+
+
+def status() -> Dict[str, Dict]:
+    return {
+        name: {k: v for k, v in entry.items() if k not in ("predictor", "feature_stats")} | {
+            "loaded": entry["predictor"] is not None,
+            "feature_stats": (entry.get("feature_stats") or {}).get("source"),
+        }
+        for name, entry in _models.items()
+    }
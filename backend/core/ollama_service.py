@@ -1,8 +1,15 @@
 # backend/core/ollama_service.py
-import requests
+import asyncio
+import json
 import math
-from typing import Optional
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
 
+import httpx
+
+from backend.core.config import settings
 from backend.dropbox.service import (
     get_sensor_cache,
     CO2_COL,
@@ -11,9 +18,176 @@ from backend.dropbox.service import (
     LEAF_COL,
     GROUND_COL,
 )
-# OLLAMA_HOST=127.0.0.1:8001
-OLLAMA_URL = "http://127.0.0.1:8001/api/chat"
-MODEL_NAME = "llama3"
+# OLLAMA_HOST=127.0.0.1:8001 (scheme optional, as for the ollama CLI)
+OLLAMA_BASE_URL = (
+    settings.OLLAMA_HOST if "://" in settings.OLLAMA_HOST else f"http://{settings.OLLAMA_HOST}"
+).rstrip("/")
+OLLAMA_URL = f"{OLLAMA_BASE_URL}/api/chat"
+MODEL_NAME = settings.OLLAMA_MODEL
+
+
+# ─────────────────────────────────────────────────────────────
+# HTTP client (one pooled AsyncClient per process)
+# ─────────────────────────────────────────────────────────────
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    # Pooled connections belong to the event loop that opened them
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client_loop = loop
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(settings.OLLAMA_READ_TIMEOUT, connect=settings.OLLAMA_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=settings.OLLAMA_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OLLAMA_MAX_CONNECTIONS,
+            ),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+# ─────────────────────────────────────────────────────────────
+# Admission control (concurrency limit + bounded wait queue)
+# ─────────────────────────────────────────────────────────────
+class AdmissionError(Exception):
+    status_code = 503
+
+    def __init__(self, detail: str, retry_after: int = 1):
+        super().__init__(detail)
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class QueueFull(AdmissionError):
+    status_code = 429
+
+
+class DeadlineExceeded(AdmissionError):
+    status_code = 503
+
+
+_gate: Dict = {"loop": None, "slots": None}
+_admission = {"active": 0, "waiting": 0}
+_counters = {"admitted": 0, "rejected_full": 0, "rejected_deadline": 0, "cancelled": 0}
+_wait_seconds: deque = deque(maxlen=256)    # recent queue waits
+_hold_seconds: deque = deque(maxlen=256)    # recent generation times
+_warmup = {"status": "pending", "seconds": None, "error": None}
+
+
+def _slots() -> asyncio.Semaphore:
+    # One semaphore per event loop (created on first use in that loop)
+    loop = asyncio.get_running_loop()
+    if _gate["loop"] is not loop:
+        _gate["loop"] = loop
+        _gate["slots"] = asyncio.Semaphore(settings.OLLAMA_MAX_CONCURRENCY)
+    return _gate["slots"]
+
+
+def _retry_after() -> int:
+    hold = sum(_hold_seconds) / len(_hold_seconds) if _hold_seconds else 1.0
+    backlog = (_admission["waiting"] + 1) / max(1, settings.OLLAMA_MAX_CONCURRENCY)
+    return max(1, math.ceil(hold * backlog))
+
+
+def deadline_for(seconds: Optional[float]) -> float:
+    """
+    Monotonic deadline for a request; None uses the configured queue timeout.
+    """
+    if seconds is None:
+        seconds = settings.OLLAMA_QUEUE_TIMEOUT_SECONDS
+    return time.monotonic() + min(max(seconds, 0.0), settings.OLLAMA_MAX_DEADLINE_SECONDS)
+
+
+@asynccontextmanager
+async def admission(deadline: float):
+    """
+    Hold one of OLLAMA_MAX_CONCURRENCY generation slots. Raises QueueFull
+    when OLLAMA_QUEUE_SIZE requests are already waiting, DeadlineExceeded
+    when no slot frees up before the deadline (the request leaves the queue).
+    """
+    slots = _slots()
+    if slots.locked() and _admission["waiting"] >= settings.OLLAMA_QUEUE_SIZE:
+        _counters["rejected_full"] += 1
+        raise QueueFull("LLM queue is full", _retry_after())
+
+    queued_at = time.monotonic()
+    _admission["waiting"] += 1
+    try:
+        async with asyncio.timeout_at(asyncio.get_running_loop().time() + (deadline - queued_at)):
+            await slots.acquire()
+    except TimeoutError:
+        _counters["rejected_deadline"] += 1
+        raise DeadlineExceeded("LLM request deadline passed while queued", _retry_after())
+    except asyncio.CancelledError:
+        _counters["cancelled"] += 1   # client went away while queued
+        raise
+    finally:
+        _admission["waiting"] -= 1
+
+    started = time.monotonic()
+    _wait_seconds.append(started - queued_at)
+    _counters["admitted"] += 1
+    _admission["active"] += 1
+    try:
+        yield
+    finally:
+        _admission["active"] -= 1
+        _hold_seconds.append(time.monotonic() - started)
+        slots.release()
+
+
+def _percentile(values, q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def metrics() -> Dict:
+    return {
+        "queue_depth": _admission["waiting"],
+        "active": _admission["active"],
+        "max_concurrency": settings.OLLAMA_MAX_CONCURRENCY,
+        "queue_size": settings.OLLAMA_QUEUE_SIZE,
+        **_counters,
+        "wait_seconds_p50": _percentile(_wait_seconds, 0.5),
+        "wait_seconds_p95": _percentile(_wait_seconds, 0.95),
+        "wait_seconds_max": max(_wait_seconds) if _wait_seconds else None,
+        "generation_seconds_p50": _percentile(_hold_seconds, 0.5),
+        "keep_alive": settings.OLLAMA_KEEP_ALIVE,
+        "warmup": dict(_warmup),
+    }
+
+
+async def warmup() -> None:
+    """
+    Load the model into Ollama (chat with no messages) so the first real
+    request doesn't pay the load; keep_alive keeps it resident afterwards.
+    """
+    started = time.monotonic()
+    try:
+        resp = await get_client().post(OLLAMA_URL, json={
+            "model": MODEL_NAME,
+            "messages": [],
+            "stream": False,
+            "keep_alive": settings.OLLAMA_KEEP_ALIVE,
+        })
+        resp.raise_for_status()
+        _warmup.update(status="ok", seconds=time.monotonic() - started, error=None)
+        print(f"🔥 Ollama model {MODEL_NAME} loaded in {_warmup['seconds']:.1f}s")
+    except Exception as e:
+        _warmup.update(status="failed", seconds=None, error=str(e))
+        print(f"⚠️ Ollama warmup failed: {e}")
 
 
 def _fmt(x: Optional[float]) -> str:
@@ -120,8 +294,10 @@ def build_sensor_context() -> str:
     return context.strip()
 
 
-def ask_carbon_status_ollama(user_message: str) -> str:
-    system_prompt = """
+# ─────────────────────────────────────────────────────────────
+# Chat
+# ─────────────────────────────────────────────────────────────
+SYSTEM_PROMPT = """
 คุณคือผู้ช่วยวิเคราะห์สภาพแวดล้อมและการดูดซับคาร์บอน
 สำหรับโครงการ Decarbonator3000 ซึ่งมีเซนเซอร์ดังนี้:
 
@@ -145,19 +321,53 @@ def ask_carbon_status_ollama(user_message: str) -> str:
 - ย่อหน้าสุดท้าย: ข้อเสนอแนะง่าย ๆ (เช่น ปรับการระบายอากาศ หรือเฝ้าดูต่อ)
 """
 
-    sensor_context = build_sensor_context()
 
+def build_messages(user_message: str) -> List[Dict[str, str]]:
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "system", "content": build_sensor_context()},
+        {"role": "user", "content": user_message},
+    ]
+
+
+async def ask_carbon_status_ollama(user_message: str, deadline: Optional[float] = None) -> str:
     payload = {
         "model": MODEL_NAME,
         "stream": False,
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "system", "content": sensor_context},
-            {"role": "user", "content": user_message},
-        ],
+        "keep_alive": settings.OLLAMA_KEEP_ALIVE,
+        "messages": build_messages(user_message),
     }
 
-    resp = requests.post(OLLAMA_URL, json=payload)
+    async with admission(deadline or deadline_for(None)):
+        resp = await get_client().post(OLLAMA_URL, json=payload)
     resp.raise_for_status()
     data = resp.json()
-    return data["message"]["content"]
\ No newline at end of file
+    return data["message"]["content"]
+
+
+async def stream_carbon_status_ollama(user_message: str, deadline: Optional[float] = None) -> AsyncIterator[str]:
+    """
+    Reply tokens as Ollama generates them (NDJSON stream, one chunk per line).
+    The generation slot is held until the stream ends or is closed.
+    """
+    payload = {
+        "model": MODEL_NAME,
+        "stream": True,
+        "keep_alive": settings.OLLAMA_KEEP_ALIVE,
+        "messages": build_messages(user_message),
+    }
+
+    async with admission(deadline or deadline_for(None)), \
+            get_client().stream("POST", OLLAMA_URL, json=payload) as resp:
+        resp.raise_for_status()
+        async for line in resp.aiter_lines():
+            if not line:
+                continue
+            chunk = json.loads(line)
+            if "error" in chunk:
+                raise RuntimeError(chunk["error"])
+            content = chunk.get("message", {}).get("content")
+            if content:
+                yield content
+            if chunk.get("done"):
+                break
@@ -0,0 +1,123 @@
+# backend/core/scheduler.py
+#
+# Asyncio ingest scheduler. Each job is one coroutine looping
+# sleep -> run, so a job can never overlap itself, and jobs are independent
+# of each other (a slow WISE-4012 refresh does not delay WISE-4051).
+# The blocking job body runs on a dedicated thread pool. Intervals are
+# jittered; failures back off exponentially up to max_backoff.
+
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from backend.core.config import settings
+
+# name -> job dict (config + last-run status)
+_jobs: Dict[str, Dict] = {}
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def add_job(
+    name: str,
+    fn: Callable[[], object],
+    interval: float = settings.INGEST_INTERVAL_SECONDS,
+    jitter: float = settings.INGEST_JITTER,
+    max_backoff: float = settings.INGEST_MAX_BACKOFF_SECONDS,
+) -> None:
+    _jobs[name] = {
+        "name": name,
+        "fn": fn,
+        "interval": interval,
+        "jitter": jitter,
+        "max_backoff": max_backoff,
+        "task": None,
+        "running": False,
+        "runs": 0,
+        "failures": 0,           # consecutive
+        "last_started": None,
+        "last_duration": None,
+        "last_lag": None,        # seconds the run started after it was due
+        "last_error": None,
+        "next_delay": None,
+    }
+
+
+def _next_delay(job: Dict) -> float:
+    base = job["interval"]
+    if job["failures"]:
+        base = min(job["interval"] * (2 ** job["failures"]), job["max_backoff"])
+    return max(0.0, base * random.uniform(1 - job["jitter"], 1 + job["jitter"]))
+
+
+async def _run_job(job: Dict) -> None:
+    loop = asyncio.get_running_loop()
+    # stagger first runs so jobs don't all hit Dropbox in the same instant
+    delay = random.uniform(0, job["jitter"] * job["interval"])
+
+    while True:
+        due = loop.time() + delay
+        job["next_delay"] = delay
+        await asyncio.sleep(delay)
+
+        job["running"] = True
+        job["last_started"] = time.time()
+        job["last_lag"] = max(0.0, loop.time() - due)
+        started = loop.time()
+        try:
+            await loop.run_in_executor(_executor, job["fn"])
+            job["failures"] = 0
+            job["last_error"] = None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job["failures"] += 1
+            job["last_error"] = str(e)
+            print(f"⚠️ Job {job['name']} failed ({job['failures']}x): {e}")
+        finally:
+            job["running"] = False
+            job["runs"] += 1
+            job["last_duration"] = loop.time() - started
+
+        delay = _next_delay(job)
+
+
+def start() -> None:
+    """
+    Start every registered job on the running loop.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=max(1, len(_jobs)), thread_name_prefix="ingest")
+    for job in _jobs.values():
+        if job["task"] is None or job["task"].done():
+            job["task"] = asyncio.create_task(_run_job(job), name=f"job:{job['name']}")
+            print(f"⏱️ Scheduled {job['name']} every ~{job['interval']:.0f}s")
+
+
+async def stop() -> None:
+    """
+    Cancel all jobs and wait for the coroutines to exit. A job body that is
+    mid-request finishes on its worker thread; it is not waited for.
+    """
+    global _executor
+    tasks = [job["task"] for job in _jobs.values() if job["task"] is not None]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    for job in _jobs.values():
+        job["task"] = None
+
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def status() -> Dict[str, Dict]:
+    return {
+        name: {
+            k: v for k, v in job.items() if k not in ("fn", "task")
+        }
+        for name, job in _jobs.items()
+    }
@@ -0,0 +1,60 @@
+# backend/core/singleflight.py
+#
+# Per-key request coalescing for expensive cold loads. The first caller for a
+# key runs the load; callers that arrive while it is in flight block on the
+# same call and get its result (or its exception) instead of loading again.
+# Callers are threads (executor workers / sync FastAPI handlers).
+
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+_calls: Dict[Hashable, Dict] = {}
+_lock = threading.Lock()
+_counters = {"loads": 0, "coalesced": 0}
+
+
+def do(key: Hashable, fn: Callable[[], Any]) -> Any:
+    with _lock:
+        call = _calls.get(key)
+        leader = call is None
+        if leader:
+            call = _calls[key] = {"done": threading.Event(), "result": None, "error": None}
+            _counters["loads"] += 1
+        else:
+            _counters["coalesced"] += 1
+
+    if not leader:
+        print(f"⏳ Joining in-flight load for {key}")
+        call["done"].wait()
+        if call["error"] is not None:
+            raise call["error"]
+        return call["result"]
+
+    try:
+        call["result"] = fn()
+        return call["result"]
+    except BaseException as e:
+        call["error"] = e
+        raise
+    finally:
+        with _lock:
+            _calls.pop(key, None)
+        call["done"].set()
+
+
+def wait(key: Hashable, timeout: float = None) -> None:
+    """
+    Block until an in-flight call for key (if any) has finished.
+    """
+    call = _calls.get(key)
+    if call is not None:
+        call["done"].wait(timeout)
+
+
+def in_flight(key: Hashable) -> bool:
+    return key in _calls
+
+
+def stats() -> Dict[str, int]:
+    with _lock:
+        return {**_counters, "in_flight": len(_calls)}
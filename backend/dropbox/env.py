@@ -8,6 +8,15 @@ DROPBOX_TOKEN = os.getenv("DROPBOX_TOKEN")
 WISE4051_ROOT = os.getenv("WISE4051_FOLDER")
 WISE4012_ROOT = os.getenv("WISE4012_FOLDER")
 
+# Local Parquet store (per device / per day folder). Empty string disables it.
+SENSOR_STORE_DIR = os.getenv("SENSOR_STORE_DIR", "./sensor_store")
+
+# Concurrent day-folder / file downloads per refresh
+DROPBOX_DOWNLOAD_WORKERS = int(os.getenv("DROPBOX_DOWNLOAD_WORKERS", "4"))
+
+# pandas CSV engine for WISE exports: "c" (default) or "pyarrow"
+CSV_ENGINE = os.getenv("CSV_ENGINE", "c")
+
 if not DROPBOX_TOKEN:
     raise RuntimeError("DROPBOX_TOKEN is not set in .env")
 
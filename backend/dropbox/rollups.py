@@ -0,0 +1,163 @@
+# backend/dropbox/rollups.py  (INGEST-TIME ROLLUPS)
+#
+# Multi-resolution bucket tables maintained as rows are ingested, so interval
+# queries never resample the raw frame. Each bucket keeps sum / count / min /
+# max per numeric column: means are exact (sum / count) and late or appended
+# rows only touch the buckets they fall into.
+
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+ROLLUP_FREQS = {
+    "1min": "1min",
+    "5min": "5min",
+    "15min": "15min",
+    "30min": "30min",
+    "1hour": "1h",
+    "1day": "1D",
+}
+
+_STATS = ("sum", "count", "min", "max")
+
+# {device: {interval: {"sum"|"count"|"min"|"max": DataFrame indexed by bucket}}}
+_rollups: Dict[str, Dict[str, Dict[str, pd.DataFrame]]] = {}
+_lock = threading.Lock()
+
+
+def _partial(df: pd.DataFrame, freq: str) -> Dict[str, pd.DataFrame]:
+    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    buckets = df["timestamp"].dt.floor(freq).rename("timestamp")
+    g = df[numeric_cols].groupby(buckets)
+    return {"sum": g.sum(), "count": g.count(), "min": g.min(), "max": g.max()}
+
+
+def _merge(old: Optional[Dict[str, pd.DataFrame]], new: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """
+    Merge a partial rollup into an existing one. Only buckets present in
+    `new` are recomputed; the rest are copied through untouched.
+    """
+    if old is None:
+        return new
+
+    cols = old["sum"].columns.union(new["sum"].columns, sort=False)
+    old = {k: v.reindex(columns=cols) for k, v in old.items()}
+    new = {k: v.reindex(columns=cols) for k, v in new.items()}
+
+    hit = new["sum"].index.intersection(old["sum"].index)
+    miss = new["sum"].index.difference(old["sum"].index)
+
+    if len(hit):
+        o = {k: old[k].loc[hit] for k in _STATS}
+        n = {k: new[k].loc[hit] for k in _STATS}
+        old["sum"].loc[hit] = o["sum"].add(n["sum"], fill_value=0)
+        old["count"].loc[hit] = o["count"].fillna(0) + n["count"].fillna(0)
+        old["min"].loc[hit] = np.fmin(o["min"], n["min"])
+        old["max"].loc[hit] = np.fmax(o["max"], n["max"])
+
+    if len(miss):
+        in_order = miss.min() > old["sum"].index.max()
+        for k in _STATS:
+            merged = pd.concat([old[k], new[k].loc[miss]])
+            old[k] = merged if in_order else merged.sort_index()
+
+    return old
+
+
+def rebuild(device: str, df: pd.DataFrame) -> None:
+    """
+    Recompute every interval from a full frame (after a re-fetch / window shift).
+    """
+    if df is None or df.empty:
+        tables = {}
+    else:
+        tables = {interval: _partial(df, freq) for interval, freq in ROLLUP_FREQS.items()}
+    with _lock:
+        _rollups[device] = tables
+
+
+def update(device: str, df_new: pd.DataFrame) -> None:
+    """
+    Fold newly ingested rows into the existing buckets.
+    """
+    if df_new is None or df_new.empty:
+        return
+    with _lock:
+        current = _rollups.get(device, {})
+        # merge into copies, then swap, so readers never see a half-updated table
+        tables = {
+            interval: _merge(
+                {k: v.copy() for k, v in current[interval].items()} if interval in current else None,
+                _partial(df_new, freq),
+            )
+            for interval, freq in ROLLUP_FREQS.items()
+        }
+        _rollups[device] = tables
+
+
+def has(device: str) -> bool:
+    return bool(_rollups.get(device))
+
+
+def clear() -> None:
+    with _lock:
+        _rollups.clear()
+
+
+def _table(device: str, interval: str, columns: Optional[List[str]]) -> Optional[Dict[str, pd.DataFrame]]:
+    table = _rollups.get(device, {}).get(interval)
+    if table is None:
+        return None
+    if columns is not None:
+        cols = [c for c in columns if c in table["sum"].columns]
+        table = {k: v[cols] for k, v in table.items()}
+    return table
+
+
+def _gap_fill(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    # Same shape as resample(): one row per bucket between first and last
+    if df.empty:
+        return df
+    full = pd.date_range(df.index.min(), df.index.max(), freq=ROLLUP_FREQS[interval])
+    return df.reindex(full).rename_axis("timestamp")
+
+
+def query_mean(
+    device: str,
+    interval: str,
+    columns: Optional[List[str]] = None,
+    since: Optional[pd.Timestamp] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Bucket means as a timestamp + columns frame (drop-in for aggregate_data).
+    Returns None when no rollup exists for the device yet.
+    since: only buckets starting at or after it (e.g. those new rows touched).
+    """
+    table = _table(device, interval, columns)
+    if table is None:
+        return None
+    total, count = table["sum"], table["count"]
+    if since is not None:
+        total, count = total.loc[since:], count.loc[since:]
+    mean = total / count.where(count > 0)
+    return _gap_fill(mean, interval).reset_index()
+
+
+def query_stats(device: str, interval: str, column: str) -> Optional[pd.DataFrame]:
+    """
+    timestamp / mean / min / max / count for one column.
+    """
+    table = _table(device, interval, [column])
+    if table is None or column not in table["sum"].columns:
+        return None
+    count = table["count"][column]
+    stats = pd.DataFrame({
+        "mean": table["sum"][column] / count.where(count > 0),
+        "min": table["min"][column],
+        "max": table["max"][column],
+        "count": count,
+    })
+    stats = stats[stats["count"] > 0]
+    return stats.rename_axis("timestamp").reset_index()
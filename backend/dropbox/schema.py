@@ -0,0 +1,109 @@
+# backend/dropbox/schema.py  (WISE CSV SCHEMA REGISTRY)
+#
+# Declares, per device, which CSV columns we keep and their compact dtypes so
+# parsing can use usecols/dtype instead of letting pandas infer every column.
+# Columns that are not declared here are skipped at parse time.
+
+import csv
+import io
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.dropbox.env import CSV_ENGINE
+
+# Bump when the registry changes so stored partitions get re-ingested.
+SCHEMA_VERSION = "1"
+
+# Timestamp layouts (see add_timestamp_column): TIM / Time strings, or
+# Year..Second integer components.
+TIMESTAMP_STRING_COLUMNS = ["TIM", "Time", "timestamp"]
+TIMESTAMP_PART_COLUMNS = [
+    "Year", "YEAR", "year",
+    "Month", "MONTH", "month",
+    "Day", "DAY", "day",
+    "Hour", "HOUR", "hour",
+    "Minute", "MINUTE", "minute",
+    "Second", "SECOND", "second",
+]
+
+SENSOR_SCHEMAS: Dict[str, Dict[str, list]] = {
+    # WISE-4051: Modbus words from the CO2 / Temp / Humid / light sensor
+    "wise4051": {
+        "float32": [f"COM_1 Wd_{i}" for i in range(8)],
+        "category": [f"COM_1 Wd_{i} Evt" for i in range(8)],
+    },
+    # WISE-4012: analog bioelectric inputs + digital inputs
+    "wise4012": {
+        "float32": [f"AI_{i} Val" for i in range(4)] + [f"DI_{i} Val" for i in range(4)],
+        "category": [f"AI_{i} Evt" for i in range(4)],
+    },
+}
+
+
+def _parse_header(data: bytes) -> Tuple[str, ...]:
+    end = data.find(b"\n")
+    line = (data if end < 0 else data[:end]).decode("utf-8-sig", errors="ignore")
+    return tuple(next(csv.reader([line.rstrip("\r")]), []))
+
+
+@lru_cache(maxsize=64)
+def resolve_read_options(device: str, header: Tuple[str, ...]) -> Optional[Dict]:
+    """
+    usecols/dtype for one CSV header. Cached per (device, header) so the
+    lookup runs once per file layout, not once per file.
+    """
+    schema = SENSOR_SCHEMAS.get(device)
+    if schema is None:
+        return None
+
+    dtype: Dict[str, str] = {}
+    for col in header:
+        if col in TIMESTAMP_STRING_COLUMNS:
+            dtype[col] = "object"
+        elif col in TIMESTAMP_PART_COLUMNS:
+            dtype[col] = "int16"
+        elif col in schema["float32"]:
+            dtype[col] = "float32"
+        elif col in schema["category"]:
+            dtype[col] = "category"
+
+    return {"usecols": [c for c in header if c in dtype], "dtype": dtype}
+
+
+def _coerce(df: pd.DataFrame, dtype: Dict[str, str]) -> pd.DataFrame:
+    """
+    Slow-path dtype fix-up for files with blanks / stray text in numeric columns.
+    """
+    for col, kind in dtype.items():
+        if col not in df.columns or kind == "object":
+            continue
+        if kind == "category":
+            df[col] = df[col].astype("category")
+        else:
+            values = pd.to_numeric(df[col], errors="coerce")
+            df[col] = values.astype(np.float32) if kind == "float32" else values
+    return df
+
+
+def read_sensor_csv(data: bytes, device: Optional[str] = None) -> pd.DataFrame:
+    """
+    Parse one WISE CSV export with the device schema (usecols + dtype).
+    Unknown devices fall back to a plain pd.read_csv.
+    """
+    opts = resolve_read_options(device, _parse_header(data)) if device else None
+    if not opts or not opts["usecols"]:
+        return pd.read_csv(io.BytesIO(data))
+
+    try:
+        return pd.read_csv(
+            io.BytesIO(data),
+            usecols=opts["usecols"],
+            dtype=opts["dtype"],
+            engine=CSV_ENGINE,
+        )
+    except (ValueError, TypeError, ImportError):
+        df = pd.read_csv(io.BytesIO(data), usecols=opts["usecols"])
+        return _coerce(df, opts["dtype"])
@@ -1,16 +1,29 @@
 # backend/dropbox/service.py  (ZIP-ACCELERATED VERSION)
 
+import base64
 import io
+import os
+import posixpath
 import tempfile
+import threading
 import zipfile
-from typing import List, Dict, Optional, Literal
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Optional, Literal, Tuple
+from datetime import datetime, timezone
 
 import dropbox
 import pandas as pd
 import numpy as np
 
-from backend.dropbox.env import DROPBOX_TOKEN, WISE4051_ROOT, WISE4012_ROOT
+from backend.core import singleflight
+from backend.core.cache import cache
+from backend.dropbox import rollups, schema, store
+from backend.dropbox.env import (
+    DROPBOX_TOKEN,
+    WISE4051_ROOT,
+    WISE4012_ROOT,
+    DROPBOX_DOWNLOAD_WORKERS,
+)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -23,15 +36,42 @@ HUMID_COL = "COM_1 Wd_2"
 LEAF_COL = "AI_0 Val"
 GROUND_COL = "AI_1 Val"
 
+DEVICE_ROOTS = {
+    "wise4051": WISE4051_ROOT,
+    "wise4012": WISE4012_ROOT,
+}
+
+
+def device_for_root(root_path: str) -> str:
+    for device, root in DEVICE_ROOTS.items():
+        if root == root_path:
+            return device
+    return store.day_key(root_path)
+
 
 # ─────────────────────────────────────────────────────────────
 # CACHE
 # ─────────────────────────────────────────────────────────────
-_cache: Dict[str, pd.DataFrame] = {}
-_sensor_cache = {
-    "wise4051": {"data": None, "last_updated": None},
-    "wise4012": {"data": None, "last_updated": None},
-}
+# Shared bounded cache (backend/core/cache.py):
+#   ("frame", root_path) -> full in-memory frame for a root (default TTL)
+#   ("sensor", device)   -> {"data", "last_updated"} snapshot for the chat context
+SENSOR_DEVICES = ("wise4051", "wise4012")
+
+# Incremental sync state per root:
+#   cursor  -> files_list_folder cursor (recursive)
+#   hashes  -> {file path_lower: content_hash} for every CSV seen
+#   folders -> {day folder path_lower: DataFrame} for the folders in the window
+#   frame   -> concatenated, timestamp-sorted frame of the window
+_sync_state: Dict[str, Dict] = {}
+SYNC_WINDOW_DAYS = 7
+
+# Monotonic data version per device; bumped only when ingest adds/changes rows
+# ("signature" = _frame_signature of the frame it was bumped for)
+_data_versions: Dict[str, Dict] = {}
+_version_lock = threading.Lock()
+
+# Called as fn(device, new_rows) after each publish that added rows
+_ingest_listeners: List[Callable[[str, pd.DataFrame], None]] = []
 
 
 # ─────────────────────────────────────────────────────────────
@@ -63,24 +103,128 @@ def list_date_folders(root_path: str) -> List[str]:
 # ─────────────────────────────────────────────────────────────
 # ZIP FAST DOWNLOAD (instead of reading CSV file-by-file)
 # ─────────────────────────────────────────────────────────────
+DOWNLOAD_CHUNK_SIZE = 1 << 16  # 64 KiB
+
+_thread_local = threading.local()
+
+# One long-lived pool for every download, so the per-thread clients (and their
+# keep-alive connections) are reused across folders, files and sync cycles
+_download_pool: Optional[ThreadPoolExecutor] = None
+_download_pool_lock = threading.Lock()
+
+
+def _thread_client() -> dropbox.Dropbox:
+    """
+    One Dropbox client (and HTTP session) per download worker thread.
+    """
+    dbx = getattr(_thread_local, "dbx", None)
+    if dbx is None:
+        dbx = _thread_local.dbx = get_client()
+    return dbx
+
+
 def download_folder_as_zip(dbx: dropbox.Dropbox, folder_path: str) -> str:
     """
     Downloads a Dropbox folder as a single ZIP file.
     MUCH faster than downloading each CSV individually.
+
+    The body is streamed to a temp file in chunks (never held in memory);
+    the caller owns the returned path and must delete it.
     """
     print(f"📦 Download ZIP: {folder_path}")
     _, res = dbx.files_download_zip(folder_path)
 
-    temp_zip_path = tempfile.mktemp(suffix=".zip")
-    with open(temp_zip_path, "wb") as f:
-        f.write(res.content)
+    fd, temp_zip_path = tempfile.mkstemp(suffix=".zip")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in res.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+    except Exception:
+        os.remove(temp_zip_path)
+        raise
+    finally:
+        res.close()
 
     return temp_zip_path
 
 
-def read_zip_csvs(zip_path: str) -> pd.DataFrame:
+def load_folder_zip(
+    dbx: dropbox.Dropbox, folder_path: str, device: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Download + parse one day folder, always removing the temp ZIP.
+    """
+    zip_path = download_folder_as_zip(dbx, folder_path)
+    try:
+        return read_zip_csvs(zip_path, device)
+    finally:
+        os.remove(zip_path)
+
+
+def _downloads() -> ThreadPoolExecutor:
+    global _download_pool
+    if _download_pool is None:
+        with _download_pool_lock:
+            if _download_pool is None:
+                _download_pool = ThreadPoolExecutor(
+                    max_workers=max(1, DROPBOX_DOWNLOAD_WORKERS), thread_name_prefix="dropbox-dl"
+                )
+    return _download_pool
+
+
+def parallel_map(fn, items: List[str]) -> Dict[str, object]:
+    """
+    Run fn(item) for every item on the shared download pool
+    (DROPBOX_DOWNLOAD_WORKERS threads). Returns {item: result or Exception}.
+    """
+    items = list(items)
+    if not items:
+        return {}
+
+    def run(item):
+        try:
+            return fn(item)
+        except Exception as e:
+            return e
+
+    if DROPBOX_DOWNLOAD_WORKERS <= 1:
+        return {item: run(item) for item in items}
+    return dict(zip(items, _downloads().map(run, items)))
+
+
+def download_csv_to_df(
+    dbx: dropbox.Dropbox, file_path: str, device: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Download a single CSV (used by incremental sync for new files only).
+    """
+    _, res = dbx.files_download(file_path)
+    df = schema.read_sensor_csv(res.content, device)
+    return add_timestamp_column(df)
+
+
+def list_folder_hashes(dbx: dropbox.Dropbox, folder_path: str) -> Dict[str, str]:
+    """
+    {path_lower: content_hash} for the CSVs in one day folder (metadata only).
+    """
+    res = dbx.files_list_folder(folder_path)
+    hashes: Dict[str, str] = {}
+
+    while True:
+        for entry in res.entries:
+            if _is_csv(entry):
+                hashes[entry.path_lower] = entry.content_hash
+        if not res.has_more:
+            break
+        res = dbx.files_list_folder_continue(res.cursor)
+
+    return hashes
+
+
+def read_zip_csvs(zip_path: str, device: Optional[str] = None) -> pd.DataFrame:
     """
     Extract CSVs from ZIP → merge → sort by timestamp.
+    With a device, columns/dtypes come from the schema registry.
     """
     dfs = []
 
@@ -88,7 +232,7 @@ def read_zip_csvs(zip_path: str) -> pd.DataFrame:
         for f in z.namelist():
             if f.lower().endswith(".csv"):
                 with z.open(f) as fp:
-                    df = pd.read_csv(fp)
+                    df = schema.read_sensor_csv(fp.read(), device)
                     df = add_timestamp_column(df)
                     dfs.append(df)
 
@@ -103,49 +247,248 @@ def read_zip_csvs(zip_path: str) -> pd.DataFrame:
 # ─────────────────────────────────────────────────────────────
 # Timestamp Builder
 # ─────────────────────────────────────────────────────────────
-def add_timestamp_column(df: pd.DataFrame) -> pd.DataFrame:
-    if "timestamp" in df.columns:
-        return df
+_TIMESTAMP_PART_KEYS = {
+    "year": ["Year", "YEAR", "year"],
+    "month": ["Month", "MONTH", "month"],
+    "day": ["Day", "DAY", "day"],
+    "hour": ["Hour", "HOUR", "hour"],
+    "minute": ["Minute", "MINUTE", "minute"],
+    "second": ["Second", "SECOND", "second"],
+}
 
-    if "TIM" in df.columns:
-        df["timestamp"] = pd.to_datetime(df["TIM"], errors="coerce")
-        return df
+_TIMESTAMP_FORMATS = [
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%d/%m/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M:%S",
+]
 
-    keys = {
-        "year": ["Year", "YEAR", "year"],
-        "month": ["Month", "MONTH", "month"],
-        "day": ["Day", "DAY", "day"],
-        "hour": ["Hour", "HOUR", "hour"],
-        "minute": ["Minute", "MINUTE", "minute"],
-        "second": ["Second", "SECOND", "second"],
-    }
+# {column name tuple: layout}, {column name tuple: strftime format}
+_timestamp_layouts: Dict[Tuple[str, ...], Tuple] = {}
+_timestamp_formats: Dict[Tuple[str, ...], Optional[str]] = {}
+
+_DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+
+def _detect_timestamp_layout(columns: Tuple[str, ...]) -> Tuple:
+    if "timestamp" in columns:
+        return ("existing",)
+    if "TIM" in columns:
+        return ("string", "TIM")
+
+    present = set(columns)
+    parts = []
+    for key in ("year", "month", "day", "hour", "minute", "second"):
+        parts.append(next((c for c in _TIMESTAMP_PART_KEYS[key] if c in present), None))
+    if all(parts):
+        return ("parts", tuple(parts))
 
-    def pick(names):
-        for n in names:
-            if n in df.columns:
-                return n
+    if "Time" in columns:
+        return ("string", "Time")
+    return ("none",)
+
+
+def _detect_timestamp_format(values: pd.Series) -> Optional[str]:
+    sample = values.dropna()
+    if sample.empty:
         return None
+    first = str(sample.iloc[0]).strip()
+    for fmt in _TIMESTAMP_FORMATS:
+        try:
+            datetime.strptime(first, fmt)
+            return fmt
+        except ValueError:
+            continue
+    return None
 
-    y = pick(keys["year"])
-    m = pick(keys["month"])
-    d = pick(keys["day"])
-    h = pick(keys["hour"])
-    mn = pick(keys["minute"])
-    s = pick(keys["second"])
-
-    if all([y, m, d, h, mn, s]):
-        df["timestamp"] = pd.to_datetime(
-            dict(year=df[y], month=df[m], day=df[d],
-                 hour=df[h], minute=df[mn], second=df[s]),
-            errors="coerce"
+
+def _parse_timestamp_strings(df: pd.DataFrame, col: str, key: Tuple[str, ...]) -> pd.Series:
+    """
+    pd.to_datetime with an explicit format detected once per file layout.
+    Re-detects if the cached format stops matching (e.g. a firmware change).
+    """
+    fmt = _timestamp_formats.get(key)
+    if fmt is None and key not in _timestamp_formats:
+        fmt = _timestamp_formats[key] = _detect_timestamp_format(df[col])
+
+    if fmt is None:
+        return pd.to_datetime(df[col], errors="coerce")
+
+    ts = pd.to_datetime(df[col], format=fmt, errors="coerce")
+    if ts.isna().sum() > df[col].isna().sum():
+        _timestamp_formats.pop(key, None)
+        fmt = _detect_timestamp_format(df[col])
+        _timestamp_formats[key] = fmt
+        ts = pd.to_datetime(df[col], format=fmt, errors="coerce") if fmt else pd.to_datetime(
+            df[col], errors="coerce"
         )
-        return df
+    return ts
+
+
+def _parts_to_datetime(df: pd.DataFrame, cols: Tuple[str, ...]) -> np.ndarray:
+    """
+    Vectorised Year..Second → datetime64[ns] (days-from-civil arithmetic).
+    Invalid / missing components give NaT, like pd.to_datetime(errors="coerce").
+    """
+    y, mo, d, h, mi, s = (
+        pd.to_numeric(df[c], errors="coerce").to_numpy(dtype="float64") for c in cols
+    )
+
+    valid = ~(np.isnan(y) | np.isnan(mo) | np.isnan(d) | np.isnan(h) | np.isnan(mi) | np.isnan(s))
+    valid &= (mo >= 1) & (mo <= 12) & (d >= 1) & (h >= 0) & (h < 24)
+    valid &= (mi >= 0) & (mi < 60) & (s >= 0) & (s < 60)
+
+    y = np.where(valid, y, 1970).astype(np.int64)
+    mo = np.where(valid, mo, 1).astype(np.int64)
+    d = np.where(valid, d, 1).astype(np.int64)
+
+    leap = (y % 4 == 0) & ((y % 100 != 0) | (y % 400 == 0))
+    dim = _DAYS_IN_MONTH[mo - 1] + ((mo == 2) & leap)
+    valid &= d <= dim
+
+    y2 = y - (mo <= 2)
+    era = np.floor_divide(y2, 400)
+    yoe = y2 - era * 400
+    mp = (mo + 9) % 12
+    doy = (153 * mp + 2) // 5 + d - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    days = era * 146097 + doe - 719468
+
+    seconds = days * 86400 + (
+        np.where(valid, h, 0) * 3600 + np.where(valid, mi, 0) * 60 + np.where(valid, s, 0)
+    ).astype(np.int64)
+    out = (seconds * 1_000_000_000).view("datetime64[ns]")
+    out[~valid] = np.datetime64("NaT")
+    return out
+
+
+def add_timestamp_column(df: pd.DataFrame) -> pd.DataFrame:
+    key = tuple(df.columns)
+    layout = _timestamp_layouts.get(key)
+    if layout is None:
+        layout = _timestamp_layouts[key] = _detect_timestamp_layout(key)
 
-    if "Time" in df.columns:
-        df["timestamp"] = pd.to_datetime(df["Time"], errors="coerce")
+    kind = layout[0]
+    if kind == "existing":
         return df
+    if kind == "string":
+        ts = _parse_timestamp_strings(df, layout[1], key)
+    elif kind == "parts":
+        ts = pd.Series(_parts_to_datetime(df, layout[1]), index=df.index)
+    else:
+        raise ValueError("Cannot detect timestamp columns.")
+
+    # datetime64[ns] whatever the layout (pandas 3 parses strings to [us] / [s]),
+    # so frames built from different layouts concat without a dtype mismatch
+    df["timestamp"] = ts.dt.as_unit("ns")
+    return df
 
-    raise ValueError("Cannot detect timestamp columns.")
+
+# ─────────────────────────────────────────────────────────────
+# Publish (in-memory frame + rollups)
+# ─────────────────────────────────────────────────────────────
+def _rollup_input(device: str, df: pd.DataFrame) -> pd.DataFrame:
+    # Rollups are built on the same columns the endpoints aggregate
+    if device == "wise4012":
+        return convert_bioelectric_voltage(df.copy())
+    return df
+
+
+def _publish_frame(
+    root_path: str, df: pd.DataFrame, new_rows: Optional[pd.DataFrame] = None
+) -> None:
+    """
+    Install a freshly ingested frame for root_path. With new_rows the rollups
+    are updated incrementally, otherwise rebuilt from the whole frame.
+    The data version is bumped (and listeners notified) only when the
+    content changed, so reloading an unchanged frame keeps clients' ETags.
+    """
+    previous = cache.peek(("frame", root_path))
+    # Owned by ingest (replaced on every publish): no TTL, so it only leaves
+    # memory under the byte budget instead of being reloaded every 15 minutes
+    cache.set(("frame", root_path), df, ttl=None)
+    device = device_for_root(root_path)
+    published = _data_versions.get(device, {}).get("signature")
+
+    if new_rows is not None:
+        changed = not new_rows.empty
+    else:
+        changed = _frame_changed(published, previous, df)
+
+    if new_rows is not None and rollups.has(device):
+        rollups.update(device, _rollup_input(device, new_rows))
+    elif changed or not rollups.has(device):
+        rollups.rebuild(device, _rollup_input(device, df))
+
+    if not changed:
+        return
+    _bump_data_version(device, _frame_signature(df))
+
+    # Rows past the previously published tail count as new on a full
+    # re-publish; the very first publish has nothing to diff against and
+    # is not pushed.
+    if new_rows is None and published is not None and published[2] is not None and not df.empty:
+        new_rows = df[df["timestamp"] > published[2]]
+    if new_rows is not None and not new_rows.empty:
+        _notify_ingest(device, new_rows)
+
+
+def _frame_signature(df: pd.DataFrame) -> Tuple:
+    # (rows, first timestamp, last timestamp) of a published frame
+    if df.empty:
+        return (0, None, None)
+    return (len(df), df["timestamp"].iloc[0], df["timestamp"].iloc[-1])
+
+
+def _frame_changed(published: Optional[Tuple], previous: Optional[pd.DataFrame], df: pd.DataFrame) -> bool:
+    """
+    Whether a full re-publish differs from the last published frame: row
+    count or time span, else (while that frame is still cached) any value.
+    """
+    if published is None or _frame_signature(df) != published:
+        return True
+    return previous is not None and previous is not df and not previous.equals(df)
+
+
+def add_ingest_listener(fn: Callable[[str, pd.DataFrame], None]) -> None:
+    if fn not in _ingest_listeners:
+        _ingest_listeners.append(fn)
+
+
+def remove_ingest_listener(fn: Callable[[str, pd.DataFrame], None]) -> None:
+    if fn in _ingest_listeners:
+        _ingest_listeners.remove(fn)
+
+
+def _notify_ingest(device: str, new_rows: pd.DataFrame) -> None:
+    for fn in list(_ingest_listeners):
+        try:
+            fn(device, new_rows)
+        except Exception as e:
+            print(f"⚠️ Ingest listener {getattr(fn, '__name__', fn)} failed: {e}")
+
+
+def _bump_data_version(device: str, signature: Tuple) -> None:
+    with _version_lock:
+        current = _data_versions.get(device, {"version": 0})
+        _data_versions[device] = {
+            "version": current["version"] + 1,
+            "last_modified": datetime.now(timezone.utc).replace(microsecond=0),
+            "signature": signature,
+        }
+
+
+def get_data_version(device: str) -> Tuple[int, Optional[datetime]]:
+    """
+    (version, last_modified) for a device; (0, None) before the first ingest.
+    """
+    entry = _data_versions.get(device)
+    if entry is None:
+        return 0, None
+    return entry["version"], entry["last_modified"]
 
 
 # ─────────────────────────────────────────────────────────────
@@ -157,24 +500,48 @@ def read_all_csv_under(
     skip_old_data: bool = True,
 ) -> pd.DataFrame:
 
-    if use_cache and root_path in _cache:
-        print(f"✔ Cache used for {root_path}")
-        return _cache[root_path]
+    if use_cache:
+        cached = cache.get(("frame", root_path))
+        if cached is not None:
+            print(f"✔ Cache used for {root_path}")
+            return cached
+
+    # Cold cache: concurrent callers for the same root share one load
+    return singleflight.do(
+        ("read_all", root_path, use_cache, skip_old_data),
+        lambda: _load_all_csv(root_path, use_cache, skip_old_data),
+    )
+
+
+def _load_all_csv(root_path: str, use_cache: bool, skip_old_data: bool) -> pd.DataFrame:
+    if use_cache:
+        # The background sync may be seeding this root right now; reuse its frame
+        singleflight.wait(("seed", root_path))
+        cached = cache.peek(("frame", root_path))
+        if cached is not None:
+            return cached
+
+    # Local store first: already-ingested days never touch Dropbox or CSV
+    if use_cache:
+        df_all = _load_from_store(root_path, skip_old_data)
+        if not df_all.empty:
+            return df_all
 
-    dbx = get_client()
     folders = list_date_folders(root_path)
     if skip_old_data and len(folders) > 7:
         folders = sorted(folders)[-7:]   # keep last 7 subfolders
 
+    def load(folder):
+        dbx = _thread_client()
+        return _load_folder(dbx, root_path, folder.lower(), list_folder_hashes(dbx, folder))
+
     dfs = []
 
-    for folder in folders:
-        try:
-            zip_path = download_folder_as_zip(dbx, folder)
-            df = read_zip_csvs(zip_path)
-            dfs.append(df)
-        except Exception as e:
-            print(f"⚠️ Failed ZIP load in {folder}: {e}")
+    for folder, result in parallel_map(load, folders).items():
+        if isinstance(result, Exception):
+            print(f"⚠️ Failed ZIP load in {folder}: {result}")
+        else:
+            dfs.append(result)
 
     if not dfs:
         return pd.DataFrame()
@@ -183,18 +550,323 @@ def read_all_csv_under(
     df_all = df_all.sort_values("timestamp").reset_index(drop=True)
 
     if use_cache:
-        _cache[root_path] = df_all
+        _publish_frame(root_path, df_all)
         print(f"💾 Cached ({len(df_all)} rows) for {root_path}")
 
     return df_all
 
 
+def _load_from_store(root_path: str, skip_old_data: bool = True) -> pd.DataFrame:
+    device = device_for_root(root_path)
+    days = store.list_days(device)
+    if skip_old_data:
+        days = days[-SYNC_WINDOW_DAYS:]
+    if not days:
+        return pd.DataFrame()
+    df_all = store.read_partitions(device, days)
+    if not df_all.empty:
+        _publish_frame(root_path, df_all)
+        print(f"💽 Loaded {len(df_all)} rows from local store for {root_path}")
+    return df_all
+
+
+def read_ingested(root_path: str) -> pd.DataFrame:
+    """
+    Already-ingested frame for a root: the in-memory frame, else the local
+    store window. Never calls Dropbox (empty until the first ingest).
+    """
+    cached = cache.get(("frame", root_path))
+    if cached is not None:
+        return cached
+
+    def load():
+        current = cache.peek(("frame", root_path))
+        return current if current is not None else _load_from_store(root_path)
+
+    return singleflight.do(("read_ingested", root_path), load)
+
+
+def read_sensor_range(
+    root_path: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    Time-range / column-subset query against the local store. Only the day
+    partitions overlapping [start, end] and the requested columns are read.
+    Falls back to the in-memory frame when the store is empty or disabled.
+    Timezone-aware bounds are converted to the naive UTC the data is kept in.
+    """
+    start = pd.Timestamp(_to_datetime64(start, None)) if start is not None else None
+    end = pd.Timestamp(_to_datetime64(end, None)) if end is not None else None
+
+    df = store.read_partitions(device_for_root(root_path), columns=columns, start=start, end=end)
+    if not df.empty:
+        return df
+
+    df = read_all_csv_under(root_path)
+    if df.empty:
+        return df
+    if start is not None:
+        df = df[df["timestamp"] >= start]
+    if end is not None:
+        df = df[df["timestamp"] <= end]
+    if columns is not None:
+        df = df[["timestamp"] + [c for c in columns if c in df.columns and c != "timestamp"]]
+    return df.reset_index(drop=True)
+
+
+# ─────────────────────────────────────────────────────────────
+# Incremental Sync (list_folder cursor + content_hash)
+# ─────────────────────────────────────────────────────────────
+def _list_folder_entries(
+    dbx: dropbox.Dropbox, root_path: str, cursor: Optional[str]
+) -> Tuple[list, str]:
+    """
+    Recursive listing of root_path (cursor=None) or the changes since cursor.
+    """
+    if cursor is None:
+        res = dbx.files_list_folder(root_path, recursive=True)
+    else:
+        res = dbx.files_list_folder_continue(cursor)
+
+    entries = list(res.entries)
+    while res.has_more:
+        res = dbx.files_list_folder_continue(res.cursor)
+        entries.extend(res.entries)
+
+    return entries, res.cursor
+
+
+def _is_csv(entry) -> bool:
+    return isinstance(entry, dropbox.files.FileMetadata) and entry.name.lower().endswith(".csv")
+
+
+def _concat_sorted(dfs: List[pd.DataFrame]) -> pd.DataFrame:
+    dfs = [df for df in dfs if df is not None and not df.empty]
+    if not dfs:
+        return pd.DataFrame()
+    df_all = pd.concat(dfs, ignore_index=True)
+    return df_all.sort_values("timestamp").reset_index(drop=True)
+
+
+def _window_folders(state: Dict) -> List[str]:
+    folders = {posixpath.dirname(p) for p in state["hashes"]}
+    return sorted(folders)[-SYNC_WINDOW_DAYS:]
+
+
+def _folder_hashes(hashes: Dict[str, str], folder: str) -> Dict[str, str]:
+    return {p: h for p, h in hashes.items() if posixpath.dirname(p) == folder}
+
+
+def _load_folder(
+    dbx: dropbox.Dropbox, root_path: str, folder: str, hashes: Dict[str, str]
+) -> pd.DataFrame:
+    """
+    Load one day folder: from the local store when its fingerprint matches,
+    otherwise ZIP-download + parse, then persist the partition.
+    """
+    device = device_for_root(root_path)
+    day = store.day_key(folder)
+    fingerprint = store.folder_fingerprint(_folder_hashes(hashes, folder), schema.SCHEMA_VERSION)
+
+    if store.has_partition(device, day, fingerprint):
+        return store.read_partitions(device, [day])
+
+    df = load_folder_zip(dbx, folder, device)
+    store.write_partition(device, day, df, fingerprint)
+    return df
+
+
+def _load_folders(root_path: str, folders: List[str], hashes: Dict[str, str]) -> Dict[str, object]:
+    """
+    _load_folder for several day folders concurrently (DROPBOX_DOWNLOAD_WORKERS).
+    """
+    return parallel_map(
+        lambda folder: _load_folder(_thread_client(), root_path, folder, hashes),
+        folders,
+    )
+
+
+def _save_folder(root_path: str, folder: str, state: Dict) -> None:
+    fingerprint = store.folder_fingerprint(
+        _folder_hashes(state["hashes"], folder), schema.SCHEMA_VERSION
+    )
+    store.write_partition(
+        device_for_root(root_path), store.day_key(folder), state["folders"][folder], fingerprint
+    )
+
+
+def _seed_sync_state(dbx: dropbox.Dropbox, root_path: str) -> Dict:
+    """
+    First sync for a root: take a recursive cursor, record every CSV's
+    content_hash, then load the day folders in the window (local store when
+    unchanged, ZIP download otherwise).
+    """
+    entries, cursor = _list_folder_entries(dbx, root_path, None)
+    state = {"cursor": cursor, "hashes": {}, "folders": {}, "frame": pd.DataFrame()}
+
+    for entry in entries:
+        if _is_csv(entry):
+            state["hashes"][entry.path_lower] = entry.content_hash
+
+    for folder, result in _load_folders(root_path, _window_folders(state), state["hashes"]).items():
+        if isinstance(result, Exception):
+            print(f"⚠️ Failed ZIP load in {folder}: {result}")
+            state.setdefault("pending", set()).add(folder)
+        else:
+            state["folders"][folder] = result
+
+    state["frame"] = _concat_sorted(list(state["folders"].values()))
+    return state
+
+
+def wait_for_changes(root_path: str, timeout: int = 30) -> bool:
+    """
+    Block on files_list_folder_longpoll until root_path changes (or timeout).
+    Returns True when there is something to sync.
+    """
+    state = _sync_state.get(root_path)
+    if state is None:
+        return True
+
+    res = get_client().files_list_folder_longpoll(state["cursor"], timeout=timeout)
+    return bool(res.changes)
+
+
+def sync_incremental(root_path: str, longpoll_timeout: Optional[int] = None) -> pd.DataFrame:
+    """
+    Incremental replacement for read_all_csv_under(..., use_cache=False).
+
+    Only CSVs that are new or whose content_hash changed since the last cursor
+    are fetched. New files are downloaded individually and appended; a folder
+    with modified or deleted files is re-fetched as a single ZIP.
+    """
+    dbx = get_client()
+    state = _sync_state.get(root_path)
+
+    if state is None:
+        def seed():
+            print(f"📥 Seeding incremental sync for {root_path}")
+            seeded = _seed_sync_state(dbx, root_path)
+            _sync_state[root_path] = seeded
+            _publish_frame(root_path, seeded["frame"])
+            return seeded
+
+        return singleflight.do(("seed", root_path), seed)["frame"]
+
+    if longpoll_timeout and not wait_for_changes(root_path, longpoll_timeout):
+        return state["frame"]
+
+    try:
+        entries, cursor = _list_folder_entries(dbx, root_path, state["cursor"])
+    except dropbox.exceptions.ApiError as e:
+        if getattr(e.error, "is_reset", lambda: False)():
+            print(f"♻️ Cursor reset for {root_path}, reseeding")
+            _sync_state.pop(root_path, None)
+            return sync_incremental(root_path)
+        raise
+
+    hashes = state["hashes"]
+    new_files: List[str] = []
+    dirty_folders = state.pop("pending", set())  # failed loads from last cycle
+
+    for entry in entries:
+        if _is_csv(entry):
+            known = hashes.get(entry.path_lower)
+            if known == entry.content_hash:
+                continue
+            if known is None:
+                new_files.append(entry.path_lower)
+            else:
+                dirty_folders.add(posixpath.dirname(entry.path_lower))
+            hashes[entry.path_lower] = entry.content_hash
+        elif isinstance(entry, dropbox.files.DeletedMetadata):
+            removed = [p for p in hashes if p == entry.path_lower or p.startswith(entry.path_lower + "/")]
+            for p in removed:
+                del hashes[p]
+                dirty_folders.add(posixpath.dirname(p))
+
+    state["cursor"] = cursor
+
+    window = _window_folders(state)
+    folders = state["folders"]
+    rebuild = bool(dirty_folders & set(folders)) or any(f not in window for f in folders)
+
+    # Drop folders that fell out of the window, re-fetch dirty ones
+    for folder in list(folders):
+        if folder not in window:
+            del folders[folder]
+
+    # Folders that (re-)entered the window with files we have never parsed
+    new_set = set(new_files)
+    seen_folders = {posixpath.dirname(p) for p in hashes if p not in new_set}
+
+    refetched = {
+        folder for folder in window
+        if folder in dirty_folders or (folder not in folders and folder in seen_folders)
+    }
+    for folder, result in _load_folders(root_path, sorted(refetched), hashes).items():
+        if isinstance(result, Exception):
+            print(f"⚠️ Failed ZIP load in {folder}: {result}")
+            state.setdefault("pending", set()).add(folder)
+        else:
+            folders[folder] = result
+            rebuild = True
+
+    to_download = [
+        p for p in new_files
+        if posixpath.dirname(p) in window and posixpath.dirname(p) not in refetched
+    ]
+    device = device_for_root(root_path)
+    downloaded = parallel_map(
+        lambda p: download_csv_to_df(_thread_client(), p, device), to_download
+    )
+
+    appended: List[pd.DataFrame] = []
+    grown = set()
+    for file_path in to_download:
+        folder = posixpath.dirname(file_path)
+        df = downloaded[file_path]
+        if isinstance(df, Exception):
+            print(f"⚠️ Failed to read {file_path}: {df}")
+            state.setdefault("pending", set()).add(folder)
+            continue
+        folders[folder] = _concat_sorted([folders.get(folder), df])
+        appended.append(df)
+        grown.add(folder)
+
+    # A folder with a failed download keeps its stale partition: its
+    # fingerprint would cover the missing file, so the pending re-fetch
+    # would then be served from the store and never parse it
+    for folder in grown - state.get("pending", set()):
+        _save_folder(root_path, folder, state)
+
+    if rebuild:
+        state["frame"] = _concat_sorted(list(folders.values()))
+    elif appended:
+        state["frame"] = _concat_sorted([state["frame"]] + appended)
+
+    if rebuild or appended:
+        print(f"🔄 Synced {root_path}: {len(appended)} new file(s), {len(refetched)} folder(s) re-fetched")
+
+    if rebuild:
+        _publish_frame(root_path, state["frame"])
+    else:
+        _publish_frame(root_path, state["frame"], _concat_sorted(appended))
+    return state["frame"]
+
+
 # ─────────────────────────────────────────────────────────────
 # Export Cleaner
 # ─────────────────────────────────────────────────────────────
 def df_to_records(df: pd.DataFrame) -> List[Dict]:
     if df.empty:
         return []
+    categories = df.select_dtypes(include=["category"]).columns
+    if len(categories):
+        df = df.astype({c: object for c in categories})
     df = df.replace({np.nan: None})
     return df.to_dict(orient="records")
 
@@ -204,19 +876,13 @@ def df_to_records(df: pd.DataFrame) -> List[Dict]:
 # ─────────────────────────────────────────────────────────────
 def aggregate_data(
     df: pd.DataFrame,
-    interval: Literal["1min", "5min", "15min", "30min", "1hour"],
+    interval: Literal["1min", "5min", "15min", "30min", "1hour", "1day"],
 ) -> pd.DataFrame:
 
     if df.empty:
         return df
 
-    freq = {
-        "1min": "1T",
-        "5min": "5T",
-        "15min": "15T",
-        "30min": "30T",
-        "1hour": "1H",
-    }.get(interval, "5T")
+    freq = rollups.ROLLUP_FREQS.get(interval, "5min")
 
     numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
     df_numeric = df[["timestamp"] + numeric_cols].copy()
@@ -225,6 +891,296 @@ def aggregate_data(
     return df_agg
 
 
+def get_aggregated(root_path: str, interval: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Interval means served from the ingest-time rollups; falls back to
+    resampling the raw frame if no rollup exists for this root.
+    All-column frames are cached per data version, so repeated requests
+    get the same object (and a cpu-tier shared copy of it is reused).
+    """
+    device = device_for_root(root_path)
+    if not rollups.has(device):
+        read_all_csv_under(root_path)   # loading publishes the rollups
+
+    key = ("aggregated", root_path, interval)
+    version = get_data_version(device)[0]
+    if columns is None:
+        cached = cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+    df = rollups.query_mean(device, interval, columns)
+    if df is None:
+        df = aggregate_data(_rollup_input(device, read_all_csv_under(root_path)), interval)
+        if columns is not None and not df.empty:
+            df = df[["timestamp"] + [c for c in columns if c in df.columns]]
+
+    if columns is None:
+        cache.set(key, (version, df))
+    return df
+
+
+def get_column_stats(root_path: str, column: str, interval: str) -> List[Dict]:
+    """
+    mean / min / max / count per bucket for one column (hourly/daily routes).
+    """
+    device = device_for_root(root_path)
+    if not rollups.has(device):
+        read_all_csv_under(root_path)
+
+    df = rollups.query_stats(device, interval, column)
+    if df is None:
+        return []
+    return df_to_records(df)
+
+
+# ─────────────────────────────────────────────────────────────
+# Time Window / Keyset Pagination (searchsorted on sorted timestamps)
+# ─────────────────────────────────────────────────────────────
+def encode_cursor(ts: pd.Timestamp, offset: int) -> str:
+    """
+    Opaque keyset cursor: last returned timestamp + how many rows sharing
+    that timestamp were already returned.
+    """
+    raw = f"{pd.Timestamp(ts).value}:{offset}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[np.datetime64, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        ns, offset = raw.split(":")
+        return np.datetime64(int(ns), "ns"), int(offset)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def _to_datetime64(value, tz) -> np.datetime64:
+    ts = pd.Timestamp(value)
+    if tz is not None and ts.tzinfo is None:
+        ts = ts.tz_localize(tz)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return np.datetime64(ts.value, "ns")
+
+
+def slice_window(
+    df: pd.DataFrame,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    after: Optional[str] = None,
+    limit: Optional[int] = None,
+    skip: int = 0,
+    tail: bool = False,
+) -> Tuple[pd.DataFrame, Optional[str]]:
+    """
+    O(log n + k) window over a timestamp-sorted frame.
+
+    - start/end bound the window (inclusive)
+    - after (cursor) or skip page forward from start; the next cursor is
+      returned when more rows remain
+    - tail=True with neither start nor after returns the last `limit` rows
+      (the /all endpoints' original behaviour)
+    """
+    if df.empty:
+        return df, None
+
+    ts = df["timestamp"].values          # datetime64[ns] (UTC for tz-aware)
+    tz = getattr(df["timestamp"].dt, "tz", None)
+
+    lo, hi = 0, len(df)
+    if start is not None:
+        lo = int(np.searchsorted(ts, _to_datetime64(start, tz), side="left"))
+    if end is not None:
+        hi = int(np.searchsorted(ts, _to_datetime64(end, tz), side="right"))
+
+    if after is not None:
+        after_ts, offset = decode_cursor(after)
+        lo = max(lo, int(np.searchsorted(ts, after_ts, side="left")) + offset)
+    elif tail and start is None and limit:
+        lo = max(lo, hi - limit)
+
+    lo = min(lo + skip, hi)
+    stop = hi if not limit else min(hi, lo + limit)
+    part = df.iloc[lo:stop]
+
+    next_cursor = None
+    if lo < stop < hi:
+        last = ts[stop - 1]
+        same = stop - int(np.searchsorted(ts, last, side="left"))
+        next_cursor = encode_cursor(pd.Timestamp(last), same)
+
+    return part, next_cursor
+
+
+# ─────────────────────────────────────────────────────────────
+# Chart Downsampling (LTTB / min-max envelope)
+# ─────────────────────────────────────────────────────────────
+# Column that drives point selection per device; other columns follow the rows
+DOWNSAMPLE_COLUMNS = {
+    "wise4051": CO2_COL,
+    "wise4012": "Leaf_Voltage",
+}
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of n shape-preserving points.
+    Bucket bounds and next-bucket averages are computed in one vectorised
+    pass; each bucket then picks its point with a vectorised argmax.
+    """
+    size = len(x)
+    if n >= size or n < 3:
+        return np.arange(size)
+
+    edges = np.floor(np.linspace(1, size - 1, n - 1)).astype(np.int64)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[: size - 1], edges[:-1]) / counts
+    avg_y = np.add.reduceat(y[: size - 1], edges[:-1]) / counts
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    out = np.empty(n, dtype=np.int64)
+    out[0], out[-1] = 0, size - 1
+    a = 0
+    for b in range(n - 2):
+        lo, hi = edges[b], edges[b + 1]
+        area = np.abs(
+            (x[a] - next_x[b]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y[b] - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        out[b + 1] = a
+    return out
+
+
+def minmax_indices(y: np.ndarray, n: int) -> np.ndarray:
+    """
+    Min/max envelope: the min and max point of n // 2 equal-count buckets.
+    """
+    size = len(y)
+    buckets = max(1, n // 2)
+    if n >= size:
+        return np.arange(size)
+
+    bucket = (np.arange(size) * buckets) // size
+    order = np.lexsort((y, bucket))                 # by bucket, then value
+    starts = np.searchsorted(bucket[order], np.arange(buckets), side="left")
+    ends = np.append(starts[1:], size) - 1
+    return np.unique(np.concatenate([order[starts], order[ends]]))
+
+
+def downsample(
+    df: pd.DataFrame,
+    points: int,
+    column: str,
+    method: Literal["lttb", "minmax"] = "lttb",
+) -> pd.DataFrame:
+    """
+    Reduce a timestamp-sorted frame to ~points rows chosen on `column`.
+    Rows where the column or timestamp is missing are ignored.
+    """
+    if df.empty or len(df) <= points or column not in df.columns:
+        return df
+
+    y = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype="float64")
+    x = df["timestamp"].values.astype("datetime64[ns]").astype(np.int64).astype("float64") / 1e9
+    valid = np.flatnonzero(~np.isnan(y) & df["timestamp"].notna().to_numpy())
+    if len(valid) <= points:
+        return df.iloc[valid]
+
+    if method == "minmax":
+        picked = minmax_indices(y[valid], points)
+    else:
+        picked = lttb_indices(x[valid], y[valid], points)
+    return df.iloc[valid[picked]]
+
+
+def sensor_source(
+    root_path: str,
+    interval: str = "raw",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Tuple[pd.DataFrame, bool]:
+    """
+    (frame a window is cut from, whether it is a cached frame that outlives
+    the request): the interval means, the in-memory raw frame, or (for a
+    start older than that, not cached) the local store range.
+    """
+    if interval != "raw":
+        return get_aggregated(root_path, interval), True
+
+    df = read_all_csv_under(root_path)
+    if start is not None and not df.empty:
+        tz = getattr(df["timestamp"].dt, "tz", None)
+        if _to_datetime64(start, tz) < df["timestamp"].values[0]:
+            older = read_sensor_range(root_path, start=start, end=end)
+            if not older.empty:
+                return older, False
+    return df, True
+
+
+def window_frame(
+    df: pd.DataFrame,
+    device: str,
+    interval: str = "raw",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    after: Optional[str] = None,
+    limit: Optional[int] = None,
+    skip: int = 0,
+    tail: bool = False,
+    points: Optional[int] = None,
+    method: Literal["lttb", "minmax"] = "lttb",
+    column: Optional[str] = None,
+) -> Tuple[pd.DataFrame, Optional[str]]:
+    """
+    Window of a sensor_source() frame. Pure function of its arguments, so it
+    can run in a cpu-tier worker process.
+    With points, the whole window is downsampled to ~points rows (limit is
+    not applied, the point budget bounds the payload).
+    With column, only timestamp + column are returned (and drive downsampling).
+    """
+    if points:
+        limit, after = None, None
+
+    part, next_cursor = slice_window(df, start, end, after, limit, skip, tail)
+
+    if interval == "raw" and device == "wise4012":
+        part = convert_bioelectric_voltage(part.copy())
+    if column is not None:
+        part = part[[c for c in ("timestamp", column) if c in part.columns]]
+
+    if points:
+        part = downsample(part, points, column or DOWNSAMPLE_COLUMNS.get(device, CO2_COL), method)
+        next_cursor = None
+
+    return part, next_cursor
+
+
+def get_sensor_frame(
+    root_path: str,
+    interval: str = "raw",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    after: Optional[str] = None,
+    limit: Optional[int] = None,
+    skip: int = 0,
+    tail: bool = False,
+    points: Optional[int] = None,
+    method: Literal["lttb", "minmax"] = "lttb",
+    column: Optional[str] = None,
+) -> Tuple[pd.DataFrame, Optional[str]]:
+    """
+    Raw or aggregated frame for a device, windowed by time / cursor.
+    Raw windows older than the in-memory frame are read from the local store.
+    """
+    df, _ = sensor_source(root_path, interval, start, end)
+    return window_frame(
+        df, device_for_root(root_path), interval, start, end, after, limit, skip, tail, points, method,
+        column,
+    )
+
+
 # ─────────────────────────────────────────────────────────────
 # Bioelectric Voltage Conversion
 # ─────────────────────────────────────────────────────────────
@@ -232,16 +1188,13 @@ def convert_bioelectric_voltage(df: pd.DataFrame) -> pd.DataFrame:
     if df is None or df.empty:
         return df
 
-    def adc_to_voltage(v):
-        try:
-            return (float(v) - 32768.0) * (20.0 / 65535.0)
-        except Exception:
-            return None
+    def adc_to_voltage(values: pd.Series) -> pd.Series:
+        return (pd.to_numeric(values, errors="coerce") - 32768.0) * (20.0 / 65535.0)
 
     if LEAF_COL in df.columns:
-        df["Leaf_Voltage"] = df[LEAF_COL].apply(adc_to_voltage)
+        df["Leaf_Voltage"] = adc_to_voltage(df[LEAF_COL])
     if GROUND_COL in df.columns:
-        df["Ground_Voltage"] = df[GROUND_COL].apply(adc_to_voltage)
+        df["Ground_Voltage"] = adc_to_voltage(df[GROUND_COL])
 
     return df
 
@@ -249,77 +1202,123 @@ def convert_bioelectric_voltage(df: pd.DataFrame) -> pd.DataFrame:
 # ─────────────────────────────────────────────────────────────
 # High-level API
 # ─────────────────────────────────────────────────────────────
-def get_co2_all_raw(limit=None, interval="raw") -> List[Dict]:
-    df = read_all_csv_under(WISE4051_ROOT)
+def get_co2_all_raw(
+    limit=None, interval="raw", start=None, end=None, after=None, points=None, method="lttb"
+) -> List[Dict]:
+    df, _ = get_sensor_frame(
+        WISE4051_ROOT, interval, start, end, after, limit, tail=True, points=points, method=method
+    )
+    return df_to_records(df)
 
-    if interval != "raw":
-        df = aggregate_data(df, interval)
 
-    if limit:
-        df = df.tail(limit)
+def get_elec_all_raw(
+    limit=None, interval="raw", start=None, end=None, after=None, points=None, method="lttb"
+) -> List[Dict]:
+    df, _ = get_sensor_frame(
+        WISE4012_ROOT, interval, start, end, after, limit, tail=True, points=points, method=method
+    )
+    return df_to_records(df)
+
 
+def get_temp_all_raw(
+    limit=None, interval="raw", start=None, end=None, after=None, points=None, method="lttb"
+) -> List[Dict]:
+    df, _ = get_sensor_frame(
+        WISE4051_ROOT, interval, start, end, after, limit, tail=True, points=points, method=method,
+        column=TEMP_COL,
+    )
     return df_to_records(df)
 
 
-def get_elec_all_raw(limit=None, interval="raw") -> List[Dict]:
-    df = read_all_csv_under(WISE4012_ROOT)
-    df = convert_bioelectric_voltage(df)
+def get_humid_all_raw(
+    limit=None, interval="raw", start=None, end=None, after=None, points=None, method="lttb"
+) -> List[Dict]:
+    df, _ = get_sensor_frame(
+        WISE4051_ROOT, interval, start, end, after, limit, tail=True, points=points, method=method,
+        column=HUMID_COL,
+    )
+    return df_to_records(df)
 
-    if interval != "raw":
-        df = aggregate_data(df, interval)
 
-    if limit:
-        df = df.tail(limit)
+def get_co2_all_hourly() -> List[Dict]:
+    return get_column_stats(WISE4051_ROOT, CO2_COL, "1hour")
+
+
+def get_co2_daily() -> List[Dict]:
+    return get_column_stats(WISE4051_ROOT, CO2_COL, "1day")
+
+
+# Temp / Humid words come from the WISE-4051 sensor (see CO2_COL)
+def get_temp_all_hourly() -> List[Dict]:
+    return get_column_stats(WISE4051_ROOT, TEMP_COL, "1hour")
 
-    return df_to_records(df)
+
+def get_temp_daily() -> List[Dict]:
+    return get_column_stats(WISE4051_ROOT, TEMP_COL, "1day")
+
+
+def get_humid_all_hourly() -> List[Dict]:
+    return get_column_stats(WISE4051_ROOT, HUMID_COL, "1hour")
+
+
+def get_humid_daily() -> List[Dict]:
+    return get_column_stats(WISE4051_ROOT, HUMID_COL, "1day")
 
 
 # ─────────────────────────────────────────────────────────────
 # REALTIME CACHE
 # ─────────────────────────────────────────────────────────────
-def refresh_sensor_cache(limit=1000, interval="5min"):
-    global _sensor_cache
+def refresh_device(device: str, limit=1000, interval="5min", incremental=True):
+    """
+    Sync one device and replace its sensor snapshot.
+    """
+    root_path = DEVICE_ROOTS[device]
 
-    print("🔁 Refreshing sensors...")
+    if incremental:
+        df = sync_incremental(root_path)
+    else:
+        # Full re-read must still replace the served frame, or readers
+        # keep whatever was cached on first request
+        df = read_all_csv_under(root_path, use_cache=False)
+        if not df.empty:
+            _publish_frame(root_path, df)
 
-    # 4051
-    df4051 = read_all_csv_under(WISE4051_ROOT, use_cache=False)
     if interval != "raw":
-        df4051 = aggregate_data(df4051, interval)
+        df = get_aggregated(root_path, interval)
+    elif device == "wise4012":
+        df = convert_bioelectric_voltage(df.copy())
     if limit:
-        df4051 = df4051.tail(limit)
+        df = df.tail(limit)
 
-    _sensor_cache["wise4051"] = {
-        "data": df4051.copy() if not df4051.empty else None,
+    cache.set(("sensor", device), {
+        "data": df.copy() if not df.empty else None,
         "last_updated": datetime.now(),
-    }
+    }, ttl=None)
 
-    # 4012
-    df4012 = read_all_csv_under(WISE4012_ROOT, use_cache=False)
-    df4012 = convert_bioelectric_voltage(df4012)
-    if interval != "raw":
-        df4012 = aggregate_data(df4012, interval)
-    if limit:
-        df4012 = df4012.tail(limit)
 
-    _sensor_cache["wise4012"] = {
-        "data": df4012.copy() if not df4012.empty else None,
-        "last_updated": datetime.now(),
-    }
+def refresh_sensor_cache(limit=1000, interval="5min", incremental=True):
+    print("🔁 Refreshing sensors...")
+    for device in SENSOR_DEVICES:
+        refresh_device(device, limit, interval, incremental)
 
 
 def get_sensor_cache():
-    return _sensor_cache
+    # Snapshot of the current entries; each is swapped whole on refresh
+    empty = {"data": None, "last_updated": None}
+    return {device: cache.peek(("sensor", device), empty) for device in SENSOR_DEVICES}
+
+
+def get_cache_stats():
+    return {**cache.stats(), "singleflight": singleflight.stats()}
 
 
 # ─────────────────────────────────────────────────────────────
 # CLEAR CACHE
 # ─────────────────────────────────────────────────────────────
 def clear_cache():
-    global _cache, _sensor_cache
-    _cache = {}
-    _sensor_cache = {
-        "wise4051": {"data": None, "last_updated": None},
-        "wise4012": {"data": None, "last_updated": None},
-    }
+    global _sync_state
+    cache.clear("frame")
+    cache.clear("sensor")
+    _sync_state = {}
+    rollups.clear()
     print("🧹 Cache cleared.")
@@ -0,0 +1,201 @@
+# backend/dropbox/store.py  (LOCAL COLUMNAR STORE)
+#
+# On-disk Parquet partitions, one file per device per Dropbox day folder:
+#
+#   {SENSOR_STORE_DIR}/{device}/{day}.parquet
+#   {SENSOR_STORE_DIR}/{device}/_manifest.json
+#
+# The manifest records, per day, the fingerprint of the folder's CSVs
+# (content_hash of every file) plus the row count and timestamp range, so an
+# unchanged day folder is never parsed from CSV again and time-range queries
+# only open the partitions they overlap.
+
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from backend.dropbox.env import SENSOR_STORE_DIR
+
+try:
+    import pyarrow.parquet as pq
+    _HAS_PYARROW = True
+except ImportError:
+    _HAS_PYARROW = False
+    print("⚠️ pyarrow not installed – local sensor store disabled")
+
+
+_manifest_lock = threading.Lock()
+_manifests: Dict[str, Dict[str, Dict]] = {}
+
+
+def is_enabled() -> bool:
+    return _HAS_PYARROW and bool(SENSOR_STORE_DIR)
+
+
+def folder_fingerprint(hashes: Dict[str, str], salt: str = "") -> str:
+    """
+    Stable fingerprint for a day folder from {path_lower: content_hash}.
+    salt lets parse-affecting changes (e.g. the CSV schema) invalidate it.
+    """
+    h = hashlib.sha1(salt.encode("utf-8"))
+    for path in sorted(hashes):
+        h.update(f"{path}:{hashes[path]}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def day_key(folder_path: str) -> str:
+    name = folder_path.rstrip("/").rsplit("/", 1)[-1]
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", name.lower())
+
+
+# ─────────────────────────────────────────────────────────────
+# Manifest
+# ─────────────────────────────────────────────────────────────
+def _device_dir(device: str) -> str:
+    return os.path.join(SENSOR_STORE_DIR, device)
+
+
+def _partition_path(device: str, day: str) -> str:
+    return os.path.join(_device_dir(device), f"{day}.parquet")
+
+
+def _manifest_path(device: str) -> str:
+    return os.path.join(_device_dir(device), "_manifest.json")
+
+
+def _load_manifest(device: str) -> Dict[str, Dict]:
+    if device not in _manifests:
+        try:
+            with open(_manifest_path(device), "r", encoding="utf-8") as f:
+                _manifests[device] = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            _manifests[device] = {}
+    return _manifests[device]
+
+
+def _save_manifest(device: str) -> None:
+    path = _manifest_path(device)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(_manifests[device], f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def get_manifest(device: str) -> Dict[str, Dict]:
+    if not is_enabled():
+        return {}
+    with _manifest_lock:
+        return dict(_load_manifest(device))
+
+
+def has_partition(device: str, day: str, fingerprint: str) -> bool:
+    entry = get_manifest(device).get(day)
+    return bool(entry) and entry.get("fingerprint") == fingerprint and os.path.exists(
+        _partition_path(device, day)
+    )
+
+
+# ─────────────────────────────────────────────────────────────
+# Write / Read
+# ─────────────────────────────────────────────────────────────
+def write_partition(device: str, day: str, df: pd.DataFrame, fingerprint: str) -> None:
+    """
+    Atomically (re)write one day partition and record it in the manifest.
+    """
+    if not is_enabled() or df is None or df.empty:
+        return
+
+    os.makedirs(_device_dir(device), exist_ok=True)
+    path = _partition_path(device, day)
+    tmp = path + ".tmp"
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+    ts = df["timestamp"]
+    with _manifest_lock:
+        manifest = _load_manifest(device)
+        manifest[day] = {
+            "fingerprint": fingerprint,
+            "rows": int(len(df)),
+            "min_ts": ts.min().isoformat() if pd.notna(ts.min()) else None,
+            "max_ts": ts.max().isoformat() if pd.notna(ts.max()) else None,
+        }
+        _save_manifest(device)
+
+
+def drop_partition(device: str, day: str) -> None:
+    if not is_enabled():
+        return
+    with _manifest_lock:
+        manifest = _load_manifest(device)
+        if manifest.pop(day, None) is not None:
+            _save_manifest(device)
+    try:
+        os.remove(_partition_path(device, day))
+    except FileNotFoundError:
+        pass
+
+
+def list_days(device: str) -> List[str]:
+    return sorted(get_manifest(device))
+
+
+def _overlaps(entry: Dict, start: Optional[pd.Timestamp], end: Optional[pd.Timestamp]) -> bool:
+    if entry.get("min_ts") is None:
+        return True
+    if end is not None and pd.Timestamp(entry["min_ts"]) > end:
+        return False
+    if start is not None and pd.Timestamp(entry["max_ts"]) < start:
+        return False
+    return True
+
+
+def read_partitions(
+    device: str,
+    days: Optional[Iterable[str]] = None,
+    columns: Optional[List[str]] = None,
+    start: Optional[pd.Timestamp] = None,
+    end: Optional[pd.Timestamp] = None,
+) -> pd.DataFrame:
+    """
+    Read only the requested day partitions / columns, optionally pruned to
+    those overlapping [start, end]. Result is sorted by timestamp.
+    """
+    if not is_enabled():
+        return pd.DataFrame()
+
+    manifest = get_manifest(device)
+    selected = sorted(manifest) if days is None else [d for d in sorted(days) if d in manifest]
+    selected = [d for d in selected if _overlaps(manifest[d], start, end)]
+
+    if columns is not None and "timestamp" not in columns:
+        columns = ["timestamp"] + list(columns)
+
+    dfs = []
+    for day in selected:
+        path = _partition_path(device, day)
+        try:
+            cols = columns
+            if cols is not None:
+                present = set(pq.read_schema(path).names)
+                cols = [c for c in cols if c in present]
+            dfs.append(pd.read_parquet(path, columns=cols))
+        except Exception as e:
+            print(f"⚠️ Failed to read partition {device}/{day}: {e}")
+
+    if not dfs:
+        return pd.DataFrame()
+
+    df = pd.concat(dfs, ignore_index=True)
+    df = df.sort_values("timestamp").reset_index(drop=True)
+
+    if start is not None:
+        df = df[df["timestamp"] >= start]
+    if end is not None:
+        df = df[df["timestamp"] <= end]
+    return df.reset_index(drop=True)
@@ -1,13 +1,15 @@
 # app/main.py
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI,HTTPException
 from backend.mongo.main import mongodb
 
-import threading
-import time
+from functools import partial
 
 from backend.api.router import api_router
+from backend.core import executor, model_registry, ollama_service, scheduler
+from backend.core.config import settings
 
 
 # ────────────────────────────────────────────────────────────
@@ -19,28 +21,36 @@ async def lifespan(app: FastAPI):
 
     from backend.dropbox import service as dropbox_service
 
-    stop_flag = {"stop": False}
-
-    def sync_loop():
-        while not stop_flag["stop"]:
-            try:
-                dropbox_service.refresh_sensor_cache(
-                    limit=1000,        # เก็บข้อมูลล่าสุด 1,000 แถว
-                    interval="5min"    # aggregate ราย 5 นาที
-                )
-            except Exception as e:
-                print(f"⚠️ Error refreshing sensor cache: {e}")
-
-            time.sleep(60)  # Sync ทุก 60 วินาที
+    # One job per device so a slow device never delays the other
+    for device in dropbox_service.SENSOR_DEVICES:
+        scheduler.add_job(
+            f"ingest:{device}",
+            partial(
+                dropbox_service.refresh_device,
+                device,
+                limit=1000,        # เก็บข้อมูลล่าสุด 1,000 แถว
+                interval="5min",   # aggregate ราย 5 นาที
+            ),
+        )
+    # First run loads the predictors; later runs hot-swap on version.txt changes
+    scheduler.add_job(
+        "models:reload",
+        model_registry.reload_if_changed,
+        interval=settings.MODEL_RELOAD_CHECK_SECONDS,
+    )
+    scheduler.start()
 
-    thread = threading.Thread(target=sync_loop, daemon=True)
-    thread.start()
+    # Load the chat model in the background; startup doesn't wait for Ollama
+    warmup = asyncio.create_task(ollama_service.warmup()) if settings.OLLAMA_WARMUP else None
 
     yield  # แอปพร้อมให้บริการ
 
     print("👋 Shutting down background Dropbox sensor sync...")
-    stop_flag["stop"] = True
-    time.sleep(1)
+    await scheduler.stop()
+    if warmup is not None:
+        warmup.cancel()
+    executor.shutdown()
+    await ollama_service.close_client()
 
 
 # ────────────────────────────────────────────────────────────
@@ -66,6 +76,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -82,6 +93,29 @@ app.include_router(api_router)
 def health():
     return {"status": "ok"}
 
+@app.get("/health/ingest")
+def ingest_health():
+    """Per-job run count, last duration / lag / error and backoff state."""
+    return scheduler.status()
+
+
+@app.get("/health/models")
+def models_health():
+    """Loaded predictors: version, load time, memory delta, persisted models."""
+    return model_registry.status()
+
+
+@app.get("/health/llm")
+def llm_health():
+    """Ollama admission queue depth / wait times and model warmup state."""
+    return ollama_service.metrics()
+
+
+@app.get("/health/executor")
+def executor_health():
+    """io / cpu tier sizes, jobs dispatched, frames shipped to cpu workers."""
+    return executor.status()
+
 @app.get("/db-info")
 async def get_database_info():
     try:
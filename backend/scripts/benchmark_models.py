@@ -0,0 +1,177 @@
+# backend/scripts/benchmark_models.py
+#
+# Latency / memory / error of the inference modes on held-out data:
+#
+#   python -m backend.scripts.benchmark_models --csv heldout.csv \
+#       --model-dir ./autogluon_models_rate_change \
+#       --variants ensemble single single:LightGBM lite
+#
+# Every variant runs in a fresh worker process, so load time and peak RSS
+# include the imports it needs (AutoGluon or not). Latency is measured on
+# single-row predict() calls, as the API serves them. Errors are reported
+# against the label column (if the CSV has it) and against the ensemble.
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from backend.core import lite_model, model_registry
+
+RESULT_PREFIX = "BENCHMARK_RESULT "
+
+
+# ─────────────────────────────────────────────────────────────
+# Worker (one variant)
+# ─────────────────────────────────────────────────────────────
+def _parse_variant(variant: str):
+    mode, _, model = variant.partition(":")
+    if mode not in model_registry.INFERENCE_MODES:
+        raise SystemExit(f"Unknown variant {variant!r}; use ensemble, single[:MODEL] or lite[:DIR]")
+    return mode, model or None
+
+
+def run_variant(variant: str, csv_path: str, model_dir: str, label: Optional[str],
+                requests: int, warmup: int) -> Dict:
+    from backend.api.routes.predict import PREDICTION_INPUT_COLUMNS
+    from backend.scripts.common import read_inputs
+
+    mode, model = _parse_variant(variant)
+    source = model_dir
+    if mode == "lite":
+        source = model or lite_model.lite_dir_for(model_dir)
+        model = None
+
+    # features are built with the variant's own stored stats
+    inputs = read_inputs(csv_path, source)
+    X = inputs[PREDICTION_INPUT_COLUMNS]
+
+    started = time.perf_counter()
+    predictor, served, _ = model_registry.load_predictor(source, mode, model)
+    load_seconds = time.perf_counter() - started
+
+    rows = [X.iloc[[i % len(X)]] for i in range(warmup + requests)]
+    latencies = []
+    for i, row in enumerate(rows):
+        t0 = time.perf_counter()
+        predictor.predict(row)
+        if i >= warmup:
+            latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    predictions = np.asarray(predictor.predict(X), dtype=np.float64)
+    batch_seconds = time.perf_counter() - t0
+
+    label = label or getattr(getattr(predictor, "predictor", predictor), "label", None) \
+        or getattr(predictor, "meta", {}).get("label")
+    latencies_ms = np.asarray(latencies) * 1000
+    return {
+        "variant": variant,
+        "model": served,
+        "rows": len(X),
+        "load_seconds": load_seconds,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "autogluon_imported": "autogluon" in sys.modules,
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p99_ms": float(np.percentile(latencies_ms, 99)),
+        "batch_rows_per_second": len(X) / batch_seconds if batch_seconds > 0 else None,
+        "predictions": predictions.tolist(),
+        "y_true": inputs[label].astype("float64").tolist() if label in inputs.columns else None,
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# Driver
+# ─────────────────────────────────────────────────────────────
+def _spawn(variant: str, args) -> Dict:
+    cmd = [
+        sys.executable, "-m", "backend.scripts.benchmark_models", "--worker", variant,
+        "--csv", args.csv, "--model-dir", args.model_dir,
+        "--requests", str(args.requests), "--warmup", str(args.warmup),
+    ]
+    if args.label:
+        cmd += ["--label", args.label]
+    out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+    for line in reversed(out.splitlines()):
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    raise RuntimeError(f"worker {variant} returned no result")
+
+
+def _errors(pred: np.ndarray, ref: Optional[List[float]]) -> Dict:
+    if ref is None:
+        return {"mae": None, "rmse": None}
+    diff = pred - np.asarray(ref, dtype=np.float64)
+    mask = ~np.isnan(diff)
+    return {
+        "mae": float(np.abs(diff[mask]).mean()) if mask.any() else None,
+        "rmse": float(np.sqrt((diff[mask] ** 2).mean())) if mask.any() else None,
+    }
+
+
+def summarize(results: List[Dict]) -> List[Dict]:
+    ensemble = next((r for r in results if r["variant"] == "ensemble"), None)
+    rows = []
+    for r in results:
+        pred = np.asarray(r["predictions"], dtype=np.float64)
+        vs_label = _errors(pred, r["y_true"])
+        vs_ensemble = _errors(pred, ensemble["predictions"] if ensemble else None)
+        rows.append({
+            **{k: v for k, v in r.items() if k not in ("predictions", "y_true")},
+            "mae": vs_label["mae"],
+            "rmse": vs_label["rmse"],
+            "mae_vs_ensemble": vs_ensemble["mae"],
+        })
+    return rows
+
+
+def _fmt(value) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.4g}"
+    return str(value)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", required=True, help="held-out rows (raw WISE-4051 export or feature table)")
+    parser.add_argument("--model-dir", required=True, help="AutoGluon predictor directory")
+    parser.add_argument("--variants", nargs="+", default=["ensemble", "single", "lite"],
+                        help="ensemble | single[:MODEL] | lite[:DIR]")
+    parser.add_argument("--label", default=None, help="label column (default: the predictor's)")
+    parser.add_argument("--requests", type=int, default=500, help="timed single-row predict() calls")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--worker", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_variant(args.worker, args.csv, args.model_dir, args.label, args.requests, args.warmup)
+        print(RESULT_PREFIX + json.dumps(result))
+        return
+
+    results = []
+    for variant in args.variants:
+        print(f"⏱️ Benchmarking {variant} ...", file=sys.stderr)
+        results.append(_spawn(variant, args))
+    rows = summarize(results)
+
+    if args.json:
+        print(json.dumps(rows, indent=1))
+        return
+    columns = ["variant", "model", "rows", "load_seconds", "peak_rss_mb", "autogluon_imported",
+               "p50_ms", "p99_ms", "batch_rows_per_second", "mae", "rmse", "mae_vs_ensemble"]
+    table = [columns] + [[_fmt(r[c]) for c in columns] for r in rows]
+    widths = [max(len(line[i]) for line in table) for i in range(len(columns))]
+    for line in table:
+        print("  ".join(cell.ljust(w) for cell, w in zip(line, widths)))
+
+
+if __name__ == "__main__":
+    main()
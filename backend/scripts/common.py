@@ -0,0 +1,26 @@
+# backend/scripts/common.py
+#
+# Helpers shared by the offline model scripts.
+
+import pandas as pd
+
+from backend.api.routes.predict import PREDICTION_INPUT_COLUMNS, build_model_inputs
+from backend.core import feature_stats
+from backend.dropbox.service import add_timestamp_column
+
+
+def read_inputs(csv_path: str, stats_dir: str) -> pd.DataFrame:
+    """
+    Model input rows from a CSV: either a feature table that already has every
+    model input (used as-is), or a raw WISE-4051 export, featurized and scaled
+    with the feature_stats.json in stats_dir.
+    """
+    df = pd.read_csv(csv_path)
+    if all(c in df.columns for c in PREDICTION_INPUT_COLUMNS):
+        return df
+
+    stats = feature_stats.load(stats_dir)
+    if stats is None:
+        raise SystemExit(f"No {feature_stats.FEATURE_STATS_FILE} in {stats_dir}")
+    df = add_timestamp_column(df).sort_values("timestamp", kind="stable").reset_index(drop=True)
+    return build_model_inputs(df, stats)
@@ -0,0 +1,44 @@
+# backend/scripts/export_lite_model.py
+#
+# Export one LightGBM model per predictor for MODEL_INFERENCE_MODE=lite:
+#
+#   python -m backend.scripts.export_lite_model --csv heldout.csv
+#   python -m backend.scripts.export_lite_model --csv heldout.csv \
+#       --model-dir ./autogluon_models_rate_change --model LightGBM --out ./lite_rc
+#
+# The CSV rows are used to check that the export reproduces AutoGluon.
+# Needs AutoGluon (the exported model doesn't).
+
+import argparse
+import os
+
+from backend.api.routes.predict import MODEL_DIRS, PREDICTION_INPUT_COLUMNS
+from backend.core import lite_model
+from backend.scripts.common import read_inputs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", required=True, help="rows to verify the export on")
+    parser.add_argument("--model-dir", action="append", help="predictor directory (default: both models)")
+    parser.add_argument("--model", default=None, help="model to export (default: best LightGBM)")
+    parser.add_argument("--out", default=None, help="output directory (default: <model-dir>/lite)")
+    parser.add_argument("--rows", type=int, default=1000, help="rows used for the check")
+    parser.add_argument("--tolerance", type=float, default=1e-6)
+    args = parser.parse_args()
+
+    from autogluon.tabular import TabularPredictor
+
+    model_dirs = args.model_dir or list(MODEL_DIRS.values())
+    if args.out and len(model_dirs) > 1:
+        parser.error("--out needs a single --model-dir")
+
+    for model_dir in model_dirs:
+        sample = read_inputs(args.csv, model_dir).tail(args.rows)[PREDICTION_INPUT_COLUMNS]
+        predictor = TabularPredictor.load(model_dir)
+        out_dir = args.out or os.path.join(model_dir, lite_model.LITE_SUBDIR)
+        lite_model.export(predictor, args.model, model_dir, out_dir, sample, args.tolerance)
+
+
+if __name__ == "__main__":
+    main()
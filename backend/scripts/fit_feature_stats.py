@@ -0,0 +1,51 @@
+# backend/scripts/fit_feature_stats.py
+#
+# Fit feature_stats.json (scaler + carbon z-score, see core/feature_stats.py)
+# on the training data and write it next to each model, tied to the model's
+# version.txt. Run it as part of training, after the predictor is saved:
+#
+#   python -m backend.scripts.fit_feature_stats --csv training.csv
+#   python -m backend.scripts.fit_feature_stats --csv training.csv \
+#       --model-dir ./autogluon_models_rate_change
+#
+# The CSV is the raw WISE-4051 export the models were trained on. A lite/
+# export inside a model directory gets the same file. The API picks the new
+# statistics up without a restart (model_registry.reload_if_changed).
+
+import argparse
+import os
+
+import pandas as pd
+
+from backend.api.routes.predict import MODEL_DIRS, fit_feature_stats
+from backend.core import feature_stats, lite_model
+from backend.dropbox.service import add_timestamp_column
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", required=True, help="raw WISE-4051 training data")
+    parser.add_argument("--model-dir", action="append", help="predictor directory (default: both models)")
+    args = parser.parse_args()
+
+    df = add_timestamp_column(pd.read_csv(args.csv))
+    df = df.sort_values("timestamp", kind="stable").reset_index(drop=True)
+    source = os.path.basename(args.csv)
+
+    for model_dir in args.model_dir or list(MODEL_DIRS.values()):
+        version = feature_stats.model_version(model_dir)
+        if version is None:
+            raise SystemExit(f"No {feature_stats.VERSION_FILE} in {model_dir}; save the model first")
+
+        stats = fit_feature_stats(df, source, version)
+        targets = [model_dir]
+        lite_dir = lite_model.lite_dir_for(model_dir)
+        if lite_dir != model_dir and feature_stats.model_version(lite_dir) == version:
+            targets.append(lite_dir)
+        for target in targets:
+            feature_stats.save(stats, target)
+            print(f"📐 Wrote {feature_stats.path_for(target)} ({stats['rows']} rows, model version {version})")
+
+
+if __name__ == "__main__":
+    main()